@@ -3,8 +3,9 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import FileResponse
 from typing import Optional, Dict, Any
+import asyncio
 import tempfile
-import json
+import orjson
 from datetime import datetime
 
 from db.schema.models import TrainingRequest, AdapterConfig
@@ -91,75 +92,28 @@ async def get_adapter(user_id: str, avatar_id: str):
             logger.info(f"No existing adapter found for user {user_id}, avatar {avatar_id}, creating new one")
             result = await persistence_manager.create_adapter()
 
-            # Download adapter backup
-            adapter_key = f"{persistence_manager._get_s3_adapter_path()}adapter_backup.zip"
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-                persistence_manager.s3_client.download_file(
-                    persistence_manager.s3_bucket,
-                    adapter_key,
-                    temp_file.name
-                )
-
-                # Get adapter metadata
-                try:
-                    metadata_key = f"{persistence_manager._get_s3_adapter_path()}backup_metadata.json"
-                    metadata_obj = persistence_manager.s3_client.get_object(
-                        Bucket=persistence_manager.s3_bucket,
-                        Key=metadata_key
-                    )
-                    metadata = json.loads(metadata_obj['Body'].read().decode('utf-8'))
-                except:
-                    metadata = {}
-
-                logger.info(f"Retrieved adapter for user {user_id}, avatar {avatar_id}")
-
-                return FileResponse(
-                    path=temp_file.name,
-                    filename=f"adapter_{user_id}_{avatar_id}.zip",
-                    media_type="application/zip",
-                    headers={
-                        "X-Adapter-Metadata": json.dumps(metadata),
-                        "X-User-ID": user_id,
-                        "X-Avatar-ID": avatar_id
-                    }
-                )
-
-
-        else:
-            # Download adapter backup
-            adapter_key = f"{persistence_manager._get_s3_adapter_path()}adapter_backup.zip"
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-                persistence_manager.s3_client.download_file(
-                    persistence_manager.s3_bucket,
-                    adapter_key,
-                    temp_file.name
-                )
-
-                # Get adapter metadata
-                try:
-                    metadata_key = f"{persistence_manager._get_s3_adapter_path()}backup_metadata.json"
-                    metadata_obj = persistence_manager.s3_client.get_object(
-                        Bucket=persistence_manager.s3_bucket,
-                        Key=metadata_key
-                    )
-                    metadata = json.loads(metadata_obj['Body'].read().decode('utf-8'))
-                except:
-                    metadata = {}
-
-                logger.info(f"Retrieved adapter for user {user_id}, avatar {avatar_id}")
-
-                return FileResponse(
-                    path=temp_file.name,
-                    filename=f"adapter_{user_id}_{avatar_id}.zip",
-                    media_type="application/zip",
-                    headers={
-                        "X-Adapter-Metadata": json.dumps(metadata),
-                        "X-User-ID": user_id,
-                        "X-Avatar-ID": avatar_id
-                    }
-                )
+        # Download adapter backup
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
+            await persistence_manager.export_adapter_archive(temp_file.name)
+
+            # Get adapter metadata; a missing or malformed object yields empty metadata
+            metadata = await asyncio.to_thread(
+                persistence_manager._get_backup_metadata,
+                persistence_manager._get_s3_adapter_path()
+            )
+
+            logger.info(f"Retrieved adapter for user {user_id}, avatar {avatar_id}")
+
+            return FileResponse(
+                path=temp_file.name,
+                filename=f"adapter_{user_id}_{avatar_id}.zip",
+                media_type="application/zip",
+                headers={
+                    "X-Adapter-Metadata": orjson.dumps(metadata).decode(),
+                    "X-User-ID": user_id,
+                    "X-Avatar-ID": avatar_id
+                }
+            )
         
     except Exception as e:
         logger.error(f"Error getting adapter: {e}")
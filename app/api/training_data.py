@@ -5,6 +5,7 @@ from fastapi.responses import JSONResponse
 from typing import List, Optional
 
 from service.persistence_service import get_adapter_persistence_manager
+from classes.AdapterPersistenceManager import uses_for_training
 from db.schema.models import MetadataUpdate, TrainingDataMetadata
 from core.logging import logger
 
@@ -38,6 +39,42 @@ async def upload_training_data(
         logger.error(f"Error uploading training data: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload training data: {str(e)}")
 
+@router.post("/{user_id}/{avatar_id}/upload-batch")
+async def upload_training_data_batch(
+    user_id: str,
+    avatar_id: str,
+    files: List[UploadFile] = File(...),
+    use_for_training: bool = Query(True)
+):
+    """Upload several training data files with a single metadata update"""
+    try:
+        persistence_manager = get_adapter_persistence_manager(avatar_id)
+        
+        # Read file contents
+        batch = []
+        for file in files:
+            batch.append((
+                file.filename,
+                await file.read(),
+                file.content_type or 'application/octet-stream',
+                use_for_training
+            ))
+        
+        # Use centralized batch upload method
+        results = await persistence_manager.upload_training_files(batch)
+        
+        return {
+            "status": "success",
+            "uploaded_files": len(results),
+            "files": results
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading training data batch: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to upload training data batch: {str(e)}")
+
 @router.get("/{user_id}/{avatar_id}/list")
 async def list_training_data(
     user_id: str,
@@ -131,7 +168,7 @@ async def get_training_metadata(user_id: str, avatar_id: str):
         metadata = await persistence_manager._get_training_metadata()
         
         # Count files by training status
-        training_files = sum(1 for use_training in metadata.values() if use_training)
+        training_files = sum(1 for entry in metadata.values() if uses_for_training(entry))
         non_training_files = len(metadata) - training_files
         
         return {
@@ -163,4 +200,18 @@ async def delete_non_training_files(user_id: str, avatar_id: str):
         
     except Exception as e:
         logger.error(f"Error deleting non-training files: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to delete non-training files: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to delete non-training files: {str(e)}")
+
+@router.post("/{user_id}/{avatar_id}/reconcile")
+async def reconcile_training_metadata(user_id: str, avatar_id: str):
+    """Repair training metadata records against the files stored in S3"""
+    try:
+        persistence_manager = get_adapter_persistence_manager(avatar_id)
+        
+        result = await persistence_manager.reconcile_training_metadata()
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"Error reconciling training metadata: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to reconcile training metadata: {str(e)}")
\ No newline at end of file
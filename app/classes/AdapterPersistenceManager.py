@@ -1,17 +1,341 @@
 # classes/AdapterPersistenceManager.py
 
 from core.logging import logger
+import io
+import asyncio
 import tempfile
 import zipfile
-from typing import Dict, Any, List, Optional
+import tarfile
+import shutil
+import threading
+import hashlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
-import json
+import orjson
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import HTTPException
 from botocore.exceptions import ClientError
+from cachetools import TTLCache
+import zstandard
 import os
-from transformers import AutoModelForCausalLM, AutoTokenizer
-from peft import LoraConfig, get_peft_model, prepare_model_for_kbit_training
+
+if TYPE_CHECKING:
+    from boto3.s3.transfer import TransferConfig
+
+try:
+    from zlib_ng import zlib_ng
+except ImportError:
+    zlib_ng = None
+
+# zipfile looks crc32 up at module level for every entry it writes or verifies;
+# zlib-ng's hardware-accelerated CRC is a drop-in replacement when installed
+if zlib_ng is not None:
+    zipfile.crc32 = zlib_ng.crc32
+
+# Adapter bundles this small are uploaded file-by-file instead of being zipped;
+# safetensors/bin weights are already dense, so deflate only costs CPU and disk
+RAW_BACKUP_MAX_FILES = 8
+RAW_BACKUP_MAX_BYTES = 512 * 1024 * 1024
+RAW_UPLOAD_WORKERS = 8
+
+# Files this small skip the managed transfer machinery and go up in one put_object
+SMALL_OBJECT_MAX_BYTES = 1024 * 1024
+
+# Zip archives are streamed to S3 in parts of this size instead of through a temp file
+MULTIPART_PART_SIZE = 16 * 1024 * 1024
+MULTIPART_UPLOAD_WORKERS = 8
+
+# Backup zips up to this size are restored from memory instead of a temp file
+RESTORE_IN_MEMORY_MAX_BYTES = 256 * 1024 * 1024
+
+# Worker threads used to extract larger backup zips
+EXTRACT_WORKERS = 4
+
+# Small files are read ahead concurrently while the zip is written; large ones
+# are copied in big chunks instead of zipfile's default 8 KiB reads
+READ_AHEAD_WORKERS = 8
+ZIP_COPY_BUFSIZE = 1024 * 1024
+
+# Training data tarballs are compressed as one zstd stream so small files share context
+ZSTD_LEVEL = 3
+TAR_BUFSIZE = 1024 * 1024
+
+# LoRA settings for new adapters never change between calls, so they are built once
+ADAPTER_LORA_SETTINGS = {
+    "r": 16,
+    "lora_alpha": 32,
+    "target_modules": ["q_proj", "v_proj"],
+    "lora_dropout": 0.1,
+    "bias": "none",
+    "task_type": "CAUSAL_LM"
+}
+
+# S3 errors that mean "back off and retry"; these are never treated as a missing object
+THROTTLE_ERROR_CODES = frozenset({'SlowDown', '503', 'ServiceUnavailable', 'Throttling', 'RequestLimitExceeded'})
+
+# Ranged reads of remote zips fetch at least this much per request
+RANGE_READ_BLOCK_SIZE = 64 * 1024
+
+# Extensions worth deflating inside backup zips; everything else is stored as-is
+COMPRESSIBLE_EXTS = frozenset({'.json', '.jsonl', '.txt', '.csv', '.md', '.yaml', '.yml', '.py'})
+
+# Listings are polled by dashboards; managers are built per request, so the cache is module-wide
+BACKUP_LIST_CACHE_TTL = 30
+_backup_list_cache = TTLCache(maxsize=1024, ttl=BACKUP_LIST_CACHE_TTL)
+_backup_list_cache_lock = threading.Lock()
+
+# HEAD responses are reused for a short window; only hits are cached so a fresh
+# adapter becomes visible immediately, and writes through this class evict their keys
+HEAD_CACHE_TTL = 30
+_head_cache = TTLCache(maxsize=4096, ttl=HEAD_CACHE_TTL)
+_head_cache_lock = threading.Lock()
+
+# Parsed training metadata.json with its ETag, keyed by object key. Reads go through
+# this; conditional writes start from it too, since a stale entry only costs a retry
+TRAINING_METADATA_CACHE_TTL = 30
+_training_metadata_cache = TTLCache(maxsize=1024, ttl=TRAINING_METADATA_CACHE_TTL)
+_training_metadata_cache_lock = threading.Lock()
+
+# Concurrent metadata reads issued while building a backup listing
+METADATA_READ_WORKERS = 8
+
+# Concurrent file uploads in a batched training data upload, and downloads before training
+TRAINING_UPLOAD_WORKERS = 16
+TRAINING_DOWNLOAD_WORKERS = 16
+
+# Read/write chunk size when streaming a compressed training file to disk
+TRAINING_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Lifetime in seconds of presigned training file download URLs
+TRAINING_DOWNLOAD_URL_EXPIRES = 3600
+
+# Concurrent delete_objects batches when removing objects; 1000 keys is the per-request limit
+DELETE_WORKERS = 8
+DELETE_BATCH_SIZE = 1000
+
+# Conditional metadata.json writes are retried this many times when another writer wins
+METADATA_WRITE_ATTEMPTS = 5
+
+
+def uses_for_training(entry: Any) -> bool:
+    """Read the training flag from a metadata.json entry, legacy bool or record"""
+    if isinstance(entry, dict):
+        return bool(entry.get("use_for_training", False))
+    return bool(entry)
+
+
+@lru_cache(maxsize=None)
+def _get_transfer_config(max_concurrency: int) -> "TransferConfig":
+    """Shared transfer config so large objects move as concurrent byte-range requests"""
+    from boto3.s3.transfer import TransferConfig
+    
+    return TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=max_concurrency,
+        use_threads=True
+    )
+
+def _local_sha256(file_path: str) -> str:
+    """SHA-256 of a local file, stored as object metadata so backups can skip unchanged files"""
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+@lru_cache(maxsize=None)
+def _check_pool_size(pool_size: int, fan_out: int) -> None:
+    """Warn once when transfers would queue on the client's connection pool"""
+    if pool_size < fan_out:
+        logger.warning(f"S3 client pool ({pool_size}) is smaller than the transfer fan-out ({fan_out})")
+
+
+def _iter_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yield file entries, reusing the type info scandir already read"""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+def _extract_zip(archive: Union[str, io.BytesIO], local_path: str, max_workers: int = EXTRACT_WORKERS) -> None:
+    """Extract a zip archive from a path or in-memory buffer, spreading members across threads for larger archives"""
+    with zipfile.ZipFile(archive, 'r') as zipf:
+        members = zipf.namelist()
+        if len(members) < max_workers * 2:
+            zipf.extractall(local_path)
+            return
+        
+        # zlib inflate and crc32 release the GIL. Archives on disk get a handle per worker;
+        # an in-memory archive shares this one, since zipfile serialises raw reads on it and
+        # a copy of the buffer per worker would multiply its memory
+        shared_zipf = None if isinstance(archive, str) else zipf
+        
+        def extract_chunk(chunk: List[str]) -> None:
+            if shared_zipf is not None:
+                for member in chunk:
+                    shared_zipf.extract(member, local_path)
+                return
+            with zipfile.ZipFile(archive, 'r') as worker_zipf:
+                for member in chunk:
+                    worker_zipf.extract(member, local_path)
+        
+        # Members sharing a top-level directory stay on one worker, since zipfile
+        # creates missing parent directories without tolerating a concurrent mkdir
+        chunks = [[] for _ in range(max_workers)]
+        for index, member in enumerate(members):
+            top_level, sep, _ = member.partition('/')
+            chunks[hash(top_level) % max_workers if sep else index % max_workers].append(member)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(extract_chunk, chunk) for chunk in chunks]
+            for future in futures:
+                future.result()
+
+def _read_ahead(files: Iterable[tuple], max_workers: int = READ_AHEAD_WORKERS) -> Iterator[tuple]:
+    """Yield (local path, ZipInfo, contents) in order, reading small files ahead on a thread pool"""
+    def load(file_path: str, arcname: str) -> tuple:
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+        if zinfo.file_size > SMALL_OBJECT_MAX_BYTES:
+            return file_path, zinfo, None
+        with open(file_path, 'rb') as f:
+            return file_path, zinfo, f.read()
+    
+    # A bounded window keeps many small reads in flight without loading the whole tree
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for file_path, arcname in files:
+            pending.append(executor.submit(load, file_path, arcname))
+            if len(pending) >= max_workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class _S3RangeFile(io.RawIOBase):
+    """Seekable read-only view of an S3 object backed by ranged GETs"""
+    
+    def __init__(self, s3_client, bucket: str, key: str, block_size: int = RANGE_READ_BLOCK_SIZE):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.block_size = block_size
+        self.size = s3_client.head_object(Bucket=bucket, Key=key)['ContentLength']
+        self._pos = 0
+        # zipfile issues many small reads; keep the last fetched window around
+        self._buf_start = 0
+        self._buf = b''
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self._pos
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(0, offset)
+        return self._pos
+    
+    def read(self, size: int = -1) -> bytes:
+        end = self.size if size is None or size < 0 else min(self.size, self._pos + size)
+        if self._pos >= end:
+            return b''
+        
+        buf_end = self._buf_start + len(self._buf)
+        if not (self._buf_start <= self._pos and end <= buf_end):
+            fetch_end = min(self.size, max(end, self._pos + self.block_size))
+            response = self.s3_client.get_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Range=f"bytes={self._pos}-{fetch_end - 1}"
+            )
+            self._buf_start = self._pos
+            self._buf = response['Body'].read()
+        
+        data = self._buf[self._pos - self._buf_start:end - self._buf_start]
+        self._pos += len(data)
+        return data
+    
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+class _StreamToS3:
+    """Write-only file object that ships its bytes to S3 as concurrently uploaded multipart parts"""
+    
+    def __init__(self, s3_client, bucket: str, key: str,
+                 part_size: int = MULTIPART_PART_SIZE,
+                 max_workers: int = MULTIPART_UPLOAD_WORKERS):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Caps buffered parts so the zip producer back-pressures when the network is the bottleneck
+        self._inflight = threading.BoundedSemaphore(max_workers * 2)
+        self.upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key)['UploadId']
+    
+    def write(self, data) -> int:
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._submit_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+    
+    def flush(self) -> None:
+        # Parts are only shipped once full; S3 rejects undersized non-final parts
+        pass
+    
+    def _submit_part(self, body: bytes) -> None:
+        part_number = len(self._futures) + 1
+        self._inflight.acquire()
+        future = self._executor.submit(
+            self.s3_client.upload_part,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        future.add_done_callback(lambda _: self._inflight.release())
+        self._futures.append(future)
+    
+    def complete(self) -> None:
+        """Ship the tail part, wait for all parts and finish the upload"""
+        if self._buffer or not self._futures:
+            self._submit_part(bytes(self._buffer))
+            self._buffer.clear()
+        try:
+            parts = [
+                {'PartNumber': part_number, 'ETag': future.result()['ETag']}
+                for part_number, future in enumerate(self._futures, start=1)
+            ]
+        finally:
+            self._executor.shutdown(wait=True)
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+    
+    def abort(self) -> None:
+        """Discard the parts uploaded so far"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
 
 class AdapterPersistenceManager:
     """Manages persistence operations for LoRA adapters and training data"""
@@ -23,18 +347,30 @@ class AdapterPersistenceManager:
         self.avatar_id = avatar_id
         self.s3_bucket = settings.s3_bucket_name
         self.HF_TOKEN = settings.HF_TOKEN
+        self.transfer_config = _get_transfer_config(settings.s3_transfer_max_concurrency)
+        _check_pool_size(
+            s3_client.meta.config.max_pool_connections,
+            max(settings.raw_backup_upload_workers, settings.s3_transfer_max_concurrency)
+        )
+        
+        # S3 prefixes only depend on user and avatar, so build them once
+        self._adapter_prefix = f"users/{user_id}/avatars/{avatar_id}/adapters/"
+        self._training_prefix = f"{self._adapter_prefix}training_data/"
+        self._metadata_prefix = f"{self._adapter_prefix}metadata/"
+        # Raw training data backups written before versioned prefixes
+        self._training_raw_legacy_prefix = f"{self._adapter_prefix}training_data_raw/"
         
     def _get_s3_adapter_path(self) -> str:
         """Get S3 path for adapters"""
-        return f"users/{self.user_id}/avatars/{self.avatar_id}/adapters/"
+        return self._adapter_prefix
     
     def _get_s3_training_data_path(self) -> str:
         """Get S3 path for training data"""
-        return f"users/{self.user_id}/avatars/{self.avatar_id}/adapters/training_data/"
+        return self._training_prefix
     
     def _get_s3_metadata_path(self) -> str:
         """Get S3 path for adapter metadata"""
-        return f"users/{self.user_id}/avatars/{self.avatar_id}/adapters/metadata/"
+        return self._metadata_prefix
     
     async def backup_adapters_to_s3(self, local_adapter_path: str) -> Dict[str, Any]:
         """Backup adapter files to S3"""
@@ -45,47 +381,387 @@ class AdapterPersistenceManager:
                     detail=f"Local adapter path not found: {local_adapter_path}"
                 )
             
-            # Create zip file of adapters
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
-                with zipfile.ZipFile(temp_file.name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for root, dirs, files in os.walk(local_adapter_path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, local_adapter_path)
-                            zipf.write(file_path, arcname)
-                
-                # Upload to S3
-                s3_key = f"{self._get_s3_adapter_path()}adapter_backup.zip"
-                self.s3_client.upload_file(temp_file.name, self.s3_bucket, s3_key)
-                
-                # Create metadata
-                metadata = {
-                    "backup_type": "adapters",
-                    "user_id": self.user_id,
-                    "avatar_id": self.avatar_id,
-                    "backup_timestamp": datetime.now().isoformat(),
-                    "file_count": sum([len(files) for _, _, files in os.walk(local_adapter_path)]),
-                    "backup_size_bytes": os.path.getsize(temp_file.name)
-                }
-                
-                # Upload metadata
-                metadata_key = f"{self._get_s3_adapter_path()}backup_metadata.json"
-                self.s3_client.put_object(
-                    Bucket=self.s3_bucket,
-                    Key=metadata_key,
-                    Body=json.dumps(metadata, indent=2),
-                    ContentType='application/json'
-                )
-                
-                # Cleanup temp file
-                os.unlink(temp_file.name)
-                
+            # Collect adapter files in a single walk
+            adapter_files = []
+            total_size = 0
+            for entry in _iter_files(local_adapter_path):
+                arcname = os.path.relpath(entry.path, local_adapter_path)
+                adapter_files.append((entry.path, arcname))
+                total_size += entry.stat().st_size
+            
+            # The previous backup decides which objects become obsolete once this one is committed
+            previous_metadata = await asyncio.to_thread(self._get_backup_metadata, self._adapter_prefix)
+            previous_raw_prefix = self._raw_backup_prefix(previous_metadata)
+            
+            # Few-file adapters skip the archive and are uploaded as-is
+            if len(adapter_files) <= RAW_BACKUP_MAX_FILES and total_size <= RAW_BACKUP_MAX_BYTES:
+                metadata = await self._backup_adapters_raw(adapter_files, total_size, previous_raw_prefix)
+                await self._publish_adapter_config(local_adapter_path)
                 return metadata
+            
+            # Stream the zip straight to S3
+            s3_key = f"{self._adapter_prefix}adapter_backup.zip"
+            _, backup_size = await asyncio.to_thread(self._zip_stream_to_s3, adapter_files, s3_key)
+            
+            # Create metadata
+            metadata = {
+                "backup_type": "adapters",
+                "format": "zip",
+                "archive_key": s3_key,
+                "user_id": self.user_id,
+                "avatar_id": self.avatar_id,
+                "backup_timestamp": datetime.now(),
+                "file_count": len(adapter_files),
+                "backup_size_bytes": backup_size
+            }
+            
+            # Upload metadata
+            metadata_key = f"{self._adapter_prefix}backup_metadata.json"
+            await asyncio.to_thread(
+                self.s3_client.put_object,
+                Bucket=self.s3_bucket,
+                Key=metadata_key,
+                Body=orjson.dumps(metadata),
+                ContentType='application/json'
+            )
+            
+            # Drop the manifest and files of a previous raw backup
+            await asyncio.to_thread(
+                self.s3_client.delete_object,
+                Bucket=self.s3_bucket,
+                Key=f"{self._adapter_prefix}adapter_backup.manifest.json"
+            )
+            if previous_raw_prefix:
+                await asyncio.to_thread(self._delete_prefix, previous_raw_prefix)
+            
+            self._invalidate_backup_listing()
+            await self._publish_adapter_config(local_adapter_path)
+            
+            return metadata
                 
         except Exception as e:
             logger.error(f"Error backing up adapters: {e}")
             raise
     
+    async def _publish_adapter_config(self, local_adapter_path: str) -> None:
+        """Store adapter_config.json next to the backup so readers never open the archive"""
+        config_path = os.path.join(local_adapter_path, "adapter_config.json")
+        if os.path.exists(config_path):
+            await asyncio.to_thread(self._upload_one, config_path, f"{self._adapter_prefix}adapter_config.json")
+    
+    async def _backup_adapters_raw(self, adapter_files: List[tuple], total_size: int,
+                                   previous_raw_prefix: Optional[str] = None) -> Dict[str, Any]:
+        """Upload adapter files individually under a fresh raw-<version>/ prefix, skipping the zip archive"""
+        adapter_path = self._adapter_prefix
+        
+        # Each backup gets its own prefix, so a failed upload never mixes files into the
+        # backup the current manifest points at
+        raw_prefix = f"{adapter_path}raw-{datetime.now().strftime('%Y%m%d%H%M%S%f')}/"
+        
+        try:
+            # Retraining usually rewrites only some files; unchanged ones are copied server-side
+            existing = {}
+            if previous_raw_prefix:
+                existing = {obj['Key']: obj for obj in await asyncio.to_thread(self._list_objects, previous_raw_prefix)}
+            arcnames = await asyncio.to_thread(
+                self._upload_raw_files, adapter_files, raw_prefix, RAW_UPLOAD_WORKERS, existing, previous_raw_prefix
+            )
+            
+            # The manifest is written last and switches readers to the new prefix in one put
+            manifest_key = f"{adapter_path}adapter_backup.manifest.json"
+            await asyncio.to_thread(
+                self.s3_client.put_object,
+                Bucket=self.s3_bucket,
+                Key=manifest_key,
+                Body=orjson.dumps({"prefix": raw_prefix, "files": arcnames}),
+                ContentType='application/json'
+            )
+        except Exception:
+            await asyncio.to_thread(self._delete_prefix, raw_prefix)
+            raise
+        
+        metadata = {
+            "backup_type": "adapters",
+            "format": "raw",
+            "archive_key": manifest_key,
+            "raw_prefix": raw_prefix,
+            "user_id": self.user_id,
+            "avatar_id": self.avatar_id,
+            "backup_timestamp": datetime.now(),
+            "file_count": len(adapter_files),
+            "backup_size_bytes": total_size
+        }
+        
+        await asyncio.to_thread(
+            self.s3_client.put_object,
+            Bucket=self.s3_bucket,
+            Key=f"{adapter_path}backup_metadata.json",
+            Body=orjson.dumps(metadata),
+            ContentType='application/json'
+        )
+        
+        # Drop the archive of a previous zip backup and the files of the previous raw backup
+        await asyncio.to_thread(self.s3_client.delete_object, Bucket=self.s3_bucket, Key=f"{adapter_path}adapter_backup.zip")
+        if previous_raw_prefix and previous_raw_prefix != raw_prefix:
+            await asyncio.to_thread(self._delete_prefix, previous_raw_prefix)
+        
+        self._invalidate_backup_listing()
+        
+        return metadata
+    
+    def _raw_backup_prefix(self, backup_metadata: Dict[str, Any], legacy_prefix: Optional[str] = None) -> Optional[str]:
+        """Prefix holding the files of a raw backup, None for other formats"""
+        if backup_metadata.get("format") != "raw":
+            return None
+        # Backups written before versioned prefixes all lived under one fixed prefix
+        return backup_metadata.get("raw_prefix", legacy_prefix or f"{self._adapter_prefix}raw/")
+    
+    def _upload_raw_files(self, files: Iterable[tuple], raw_prefix: str, max_workers: int,
+                          existing: Optional[Dict[str, Dict[str, Any]]] = None,
+                          previous_prefix: Optional[str] = None) -> List[str]:
+        """Upload (local path, arcname) pairs concurrently under a prefix, reusing objects listed in existing under previous_prefix that already match"""
+        existing = existing or {}
+        previous_prefix = previous_prefix or raw_prefix
+        arcnames = []
+        # Bound in-flight uploads so a huge tree is never queued in memory at once
+        slots = threading.BoundedSemaphore(max_workers * 2)
+        futures = []
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for file_path, arcname in files:
+                arcname = arcname.replace('\\', '/')
+                slots.acquire()
+                s3_key = f"{raw_prefix}{arcname}"
+                future = executor.submit(
+                    self._upload_if_changed, file_path, s3_key, existing.get(f"{previous_prefix}{arcname}")
+                )
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+                arcnames.append(arcname)
+            for future in futures:
+                future.result()
+        
+        return arcnames
+    
+    def _upload_if_changed(self, file_path: str, s3_key: str, listed: Optional[Dict[str, Any]]) -> None:
+        """Upload a local file unless the listed object already holds the same bytes, copying it server-side if it lives elsewhere"""
+        # ETags depend on how an object was uploaded or copied, so compare a content hash
+        # kept in the object's metadata instead
+        sha256 = _local_sha256(file_path)
+        if listed is not None and listed['Size'] == os.path.getsize(file_path):
+            try:
+                head_response = self.s3_client.head_object(Bucket=self.s3_bucket, Key=listed['Key'])
+            except ClientError as e:
+                if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                    raise
+                head_response = {}
+            if head_response.get('Metadata', {}).get('sha256') == sha256:
+                if listed['Key'] != s3_key:
+                    # The copy keeps the source metadata, hash included
+                    self.s3_client.copy_object(
+                        Bucket=self.s3_bucket,
+                        Key=s3_key,
+                        CopySource={'Bucket': self.s3_bucket, 'Key': listed['Key']}
+                    )
+                return
+        self._upload_one(file_path, s3_key, sha256)
+    
+    def _upload_one(self, file_path: str, s3_key: str, sha256: Optional[str] = None) -> None:
+        """Upload a local file, using a single put_object for small files"""
+        metadata = {'sha256': sha256} if sha256 else {}
+        if os.path.getsize(file_path) <= SMALL_OBJECT_MAX_BYTES:
+            with open(file_path, 'rb') as f:
+                self.s3_client.put_object(Bucket=self.s3_bucket, Key=s3_key, Body=f.read(), Metadata=metadata)
+            return
+        self.s3_client.upload_file(
+            file_path, self.s3_bucket, s3_key,
+            ExtraArgs={'Metadata': metadata}, Config=self.transfer_config
+        )
+    
+    def _zip_stream_to_s3(self, files: Iterable[tuple], s3_key: str) -> Tuple[int, int]:
+        """Zip (local path, arcname) pairs directly into a multipart upload, returning file count and archive size"""
+        stream = _StreamToS3(self.s3_client, self.s3_bucket, s3_key)
+        file_count = 0
+        try:
+            with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                for file_path, zinfo, data in _read_ahead(files):
+                    # Tensor blobs barely shrink under deflate, so only text is compressed
+                    ext = os.path.splitext(zinfo.filename)[1].lower()
+                    zinfo.compress_type = zipfile.ZIP_DEFLATED if ext in COMPRESSIBLE_EXTS else zipfile.ZIP_STORED
+                    if data is not None:
+                        zipf.writestr(zinfo, data)
+                    else:
+                        with open(file_path, 'rb') as src, zipf.open(zinfo, 'w') as dest:
+                            shutil.copyfileobj(src, dest, ZIP_COPY_BUFSIZE)
+                    file_count += 1
+            stream.complete()
+        except Exception:
+            stream.abort()
+            raise
+        return file_count, stream.bytes_written
+    
+    def _tar_zst_stream_to_s3(self, files: Iterable[tuple], s3_key: str) -> Tuple[int, int]:
+        """Tar (local path, arcname) pairs through one zstd stream into a multipart upload"""
+        stream = _StreamToS3(self.s3_client, self.s3_bucket, s3_key)
+        file_count = 0
+        try:
+            # One compressor context for the whole tree instead of a fresh deflate stream per entry
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+            zst = compressor.stream_writer(stream, closefd=False)
+            with tarfile.open(fileobj=zst, mode='w|', bufsize=TAR_BUFSIZE) as tar:
+                for file_path, arcname in files:
+                    tar.add(file_path, arcname=arcname, recursive=False)
+                    file_count += 1
+            zst.close()
+            stream.complete()
+        except Exception:
+            stream.abort()
+            raise
+        return file_count, stream.bytes_written
+    
+    def _restore_tar_zst(self, s3_key: str, local_path: str) -> None:
+        """Stream a tar.zst backup from S3 and extract it without a local copy of the archive"""
+        obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=s3_key)
+        with zstandard.ZstdDecompressor().stream_reader(obj['Body']) as reader:
+            with tarfile.open(fileobj=reader, mode='r|', bufsize=TAR_BUFSIZE) as tar:
+                tar.extractall(local_path, filter='data')
+    
+    def _delete_stale_artifacts(self, s3_prefix: str, artifact_stem: str, current_key: str) -> None:
+        """Delete backup artifacts left over from other formats under a prefix"""
+        for ext in ("zip", "tar.zst", "manifest.json"):
+            key = f"{s3_prefix}{artifact_stem}.{ext}"
+            if key != current_key:
+                self.s3_client.delete_object(Bucket=self.s3_bucket, Key=key)
+    
+    def _invalidate_backup_listing(self) -> None:
+        """Drop the cached backup listing after backups change"""
+        with _backup_list_cache_lock:
+            _backup_list_cache.pop((self.s3_bucket, self.user_id, self.avatar_id), None)
+        self._forget_head(f"{self._adapter_prefix}backup_metadata.json")
+    
+    def _cached_head(self, key: str) -> Optional[Dict[str, Any]]:
+        """HEAD an object through the short-lived cache, None if it does not exist"""
+        cache_key = (self.s3_bucket, key)
+        with _head_cache_lock:
+            cached = _head_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            head_response = self.s3_client.head_object(Bucket=self.s3_bucket, Key=key)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None
+            raise
+        
+        with _head_cache_lock:
+            _head_cache[cache_key] = head_response
+        return head_response
+    
+    def _forget_head(self, key: str) -> None:
+        """Evict a cached HEAD response after the object changes"""
+        with _head_cache_lock:
+            _head_cache.pop((self.s3_bucket, key), None)
+    
+    def _get_backup_metadata(self, s3_prefix: str) -> Dict[str, Any]:
+        """Get backup metadata stored under a prefix, empty if there is none"""
+        try:
+            metadata_obj = self.s3_client.get_object(
+                Bucket=self.s3_bucket,
+                Key=f"{s3_prefix}backup_metadata.json"
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return {}
+            raise
+        
+        try:
+            return orjson.loads(metadata_obj['Body'].read())
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Ignoring malformed backup metadata under {s3_prefix}: {e}")
+            return {}
+    
+    def _get_backup_metadata_batch(self, s3_prefixes: Iterable[str],
+                                   max_workers: int = METADATA_READ_WORKERS) -> Dict[str, Dict[str, Any]]:
+        """Get backup metadata for several prefixes concurrently"""
+        s3_prefixes = list(s3_prefixes)
+        if len(s3_prefixes) <= 1:
+            return {prefix: self._get_backup_metadata(prefix) for prefix in s3_prefixes}
+        
+        # A missing or unreadable metadata object leaves the entry bare;
+        # any other S3 error propagates so throttling is not masked
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(s3_prefixes))) as executor:
+            return dict(zip(s3_prefixes, executor.map(self._get_backup_metadata, s3_prefixes)))
+    
+    def _restore_zip(self, s3_key: str, local_path: str, archive_size: Optional[int]) -> None:
+        """Download a backup zip and extract it, keeping archives of known small size off the disk"""
+        if archive_size is not None and archive_size <= RESTORE_IN_MEMORY_MAX_BYTES:
+            buffer = io.BytesIO()
+            self.s3_client.download_fileobj(self.s3_bucket, s3_key, buffer, Config=self.transfer_config)
+            buffer.seek(0)
+            _extract_zip(buffer, local_path)
+            return
+        
+        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
+            try:
+                self.s3_client.download_file(self.s3_bucket, s3_key, temp_file.name, Config=self.transfer_config)
+                _extract_zip(temp_file.name, local_path)
+            finally:
+                # Cleanup temp file
+                os.unlink(temp_file.name)
+    
+    def _read_adapter_config(self, backup_metadata: Dict[str, Any]) -> Optional[bytes]:
+        """Read adapter_config.json, preferring the standalone copy over the backup"""
+        try:
+            obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=f"{self._adapter_prefix}adapter_config.json")
+            return obj['Body'].read()
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                raise
+        return self._read_backup_member(backup_metadata, "adapter_config.json")
+    
+    def _read_backup_member(self, backup_metadata: Dict[str, Any], arcname: str) -> Optional[bytes]:
+        """Read one file out of the adapter backup, None if the backup does not contain it"""
+        raw_prefix = self._raw_backup_prefix(backup_metadata)
+        if raw_prefix:
+            try:
+                obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=f"{raw_prefix}{arcname}")
+            except ClientError as e:
+                if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                    return None
+                raise
+            return obj['Body'].read()
+        
+        # Ranged reads fetch the central directory and the one entry, not the whole archive
+        s3_key = backup_metadata.get("archive_key", f"{self._adapter_prefix}adapter_backup.zip")
+        with zipfile.ZipFile(_S3RangeFile(self.s3_client, self.s3_bucket, s3_key)) as zipf:
+            try:
+                return zipf.read(arcname)
+            except KeyError:
+                return None
+    
+    def _download_raw_backup(self, manifest_key: str, local_path: str, max_workers: int = RAW_UPLOAD_WORKERS) -> None:
+        """Download every file listed in a raw backup manifest"""
+        manifest_obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=manifest_key)
+        manifest = orjson.loads(manifest_obj['Body'].read())
+        
+        targets = []
+        for arcname in manifest["files"]:
+            local_file_path = os.path.join(local_path, arcname)
+            os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
+            targets.append((f"{manifest['prefix']}{arcname}", local_file_path))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.s3_client.download_file, self.s3_bucket, key, local_file_path,
+                    Config=self.transfer_config
+                )
+                for key, local_file_path in targets
+            ]
+            for future in futures:
+                future.result()
+    
     async def backup_training_data_to_s3(self, local_training_data_path: str) -> Dict[str, Any]:
         """Backup training data to S3"""
         try:
@@ -95,43 +771,149 @@ class AdapterPersistenceManager:
                     detail=f"Local training data path not found: {local_training_data_path}"
                 )
             
-            # Create zip file of training data
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
-                with zipfile.ZipFile(temp_file.name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for root, dirs, files in os.walk(local_training_data_path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, local_training_data_path)
-                            zipf.write(file_path, arcname)
-                
-                # Upload to S3
-                s3_key = f"{self._get_s3_training_data_path()}training_data_backup.zip"
-                self.s3_client.upload_file(temp_file.name, self.s3_bucket, s3_key)
+            if self.settings.raw_training_data_backup:
+                return await self.backup_training_data_to_s3_raw(local_training_data_path)
+            
+            training_data_path = self._training_prefix
+            previous_metadata = await asyncio.to_thread(self._get_backup_metadata, training_data_path)
+            previous_raw_prefix = self._raw_backup_prefix(previous_metadata, self._training_raw_legacy_prefix)
+            if self.settings.zstd_training_data_backup:
+                backup_format, stream_to_s3 = "tar.zst", self._tar_zst_stream_to_s3
+            else:
+                backup_format, stream_to_s3 = "zip", self._zip_stream_to_s3
+            
+            # Stream the archive straight to S3, counting files in the same traversal
+            s3_key = f"{training_data_path}training_data_backup.{backup_format}"
+            file_count, backup_size = await asyncio.to_thread(
+                stream_to_s3,
+                ((entry.path, os.path.relpath(entry.path, local_training_data_path))
+                 for entry in _iter_files(local_training_data_path)),
+                s3_key
+            )
+            
+            # Create metadata
+            metadata = {
+                "backup_type": "training_data",
+                "format": backup_format,
+                "archive_key": s3_key,
+                "user_id": self.user_id,
+                "avatar_id": self.avatar_id,
+                "backup_timestamp": datetime.now(),
+                "file_count": file_count,
+                "backup_size_bytes": backup_size
+            }
+            
+            # Upload metadata
+            metadata_key = f"{self._training_prefix}backup_metadata.json"
+            await asyncio.to_thread(
+                self.s3_client.put_object,
+                Bucket=self.s3_bucket,
+                Key=metadata_key,
+                Body=orjson.dumps(metadata),
+                ContentType='application/json'
+            )
+            
+            # Drop the artifacts of previous backups written in other formats
+            await asyncio.to_thread(
+                self._delete_stale_artifacts,
+                training_data_path,
+                "training_data_backup",
+                s3_key
+            )
+            if previous_raw_prefix:
+                await asyncio.to_thread(self._delete_prefix, previous_raw_prefix)
+            
+            self._invalidate_backup_listing()
+            
+            return metadata
                 
-                # Create metadata
-                metadata = {
-                    "backup_type": "training_data",
-                    "user_id": self.user_id,
-                    "avatar_id": self.avatar_id,
-                    "backup_timestamp": datetime.now().isoformat(),
-                    "file_count": sum([len(files) for _, _, files in os.walk(local_training_data_path)]),
-                    "backup_size_bytes": os.path.getsize(temp_file.name)
-                }
+        except Exception as e:
+            logger.error(f"Error backing up training data: {e}")
+            raise
+    
+    async def backup_training_data_to_s3_raw(self, local_training_data_path: str) -> Dict[str, Any]:
+        """Backup training data to S3 as individual objects uploaded concurrently"""
+        try:
+            if not os.path.exists(local_training_data_path):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Local training data path not found: {local_training_data_path}"
+                )
+            
+            training_data_path = self._training_prefix
+            previous_metadata = await asyncio.to_thread(self._get_backup_metadata, training_data_path)
+            previous_raw_prefix = self._raw_backup_prefix(previous_metadata, self._training_raw_legacy_prefix)
+            
+            # Kept outside the training data prefix so backups never show up as training files.
+            # Each backup gets its own prefix, so a failed run never mixes files into the
+            # backup the current manifest points at
+            raw_prefix = f"{self._adapter_prefix}training_data_raw-{datetime.now().strftime('%Y%m%d%H%M%S%f')}/"
+            total_size = 0
+            
+            def iter_files():
+                nonlocal total_size
+                for entry in _iter_files(local_training_data_path):
+                    total_size += entry.stat().st_size
+                    yield entry.path, os.path.relpath(entry.path, local_training_data_path)
+            
+            try:
+                # Files unchanged since the previous backup are copied server-side
+                existing = {}
+                if previous_raw_prefix:
+                    existing = {obj['Key']: obj for obj in await asyncio.to_thread(self._list_objects, previous_raw_prefix)}
+                arcnames = await asyncio.to_thread(
+                    self._upload_raw_files, iter_files(), raw_prefix,
+                    self.settings.raw_backup_upload_workers, existing, previous_raw_prefix
+                )
                 
-                # Upload metadata
-                metadata_key = f"{self._get_s3_training_data_path()}backup_metadata.json"
-                self.s3_client.put_object(
+                # The manifest is written last and switches readers to the new prefix in one put
+                manifest_key = f"{training_data_path}training_data_backup.manifest.json"
+                await asyncio.to_thread(
+                    self.s3_client.put_object,
                     Bucket=self.s3_bucket,
-                    Key=metadata_key,
-                    Body=json.dumps(metadata, indent=2),
+                    Key=manifest_key,
+                    Body=orjson.dumps({"prefix": raw_prefix, "files": arcnames}),
                     ContentType='application/json'
                 )
-                
-                # Cleanup temp file
-                os.unlink(temp_file.name)
-                
-                return metadata
-                
+            except Exception:
+                await asyncio.to_thread(self._delete_prefix, raw_prefix)
+                raise
+            
+            metadata = {
+                "backup_type": "training_data",
+                "format": "raw",
+                "archive_key": manifest_key,
+                "raw_prefix": raw_prefix,
+                "user_id": self.user_id,
+                "avatar_id": self.avatar_id,
+                "backup_timestamp": datetime.now(),
+                "file_count": len(arcnames),
+                "backup_size_bytes": total_size
+            }
+            
+            await asyncio.to_thread(
+                self.s3_client.put_object,
+                Bucket=self.s3_bucket,
+                Key=f"{training_data_path}backup_metadata.json",
+                Body=orjson.dumps(metadata),
+                ContentType='application/json'
+            )
+            
+            # Drop the archives of previous backups written in other formats
+            await asyncio.to_thread(
+                self._delete_stale_artifacts,
+                training_data_path,
+                "training_data_backup",
+                manifest_key
+            )
+            # Files deleted locally go with the previous backup's prefix
+            if previous_raw_prefix and previous_raw_prefix != raw_prefix:
+                await asyncio.to_thread(self._delete_prefix, previous_raw_prefix)
+            
+            self._invalidate_backup_listing()
+            
+            return metadata
+            
         except Exception as e:
             logger.error(f"Error backing up training data: {e}")
             raise
@@ -139,32 +921,26 @@ class AdapterPersistenceManager:
     async def restore_adapters_from_s3(self, local_adapter_path: str) -> None:
         """Restore adapter files from S3"""
         try:
-            s3_key = f"{self._get_s3_adapter_path()}adapter_backup.zip"
+            s3_key = f"{self._adapter_prefix}adapter_backup.zip"
             
-            # Check if backup exists
-            try:
-                self.s3_client.head_object(Bucket=self.s3_bucket, Key=s3_key)
-            except ClientError as e:
-                if e.response['Error']['Code'] == '404':
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"No adapter backup found for user {self.user_id}, avatar {self.avatar_id}"
-                    )
-                raise
+            # Check if backup exists and which format it was written in
+            backup_metadata = await asyncio.to_thread(self._get_backup_metadata, self._adapter_prefix)
+            if not backup_metadata:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No adapter backup found for user {self.user_id}, avatar {self.avatar_id}"
+                )
             
             # Create local directory if it doesn't exist
             os.makedirs(local_adapter_path, exist_ok=True)
             
+            if backup_metadata.get("format") == "raw":
+                await asyncio.to_thread(self._download_raw_backup, backup_metadata["archive_key"], local_adapter_path)
+                return
+            
             # Download and extract
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
-                self.s3_client.download_file(self.s3_bucket, s3_key, temp_file.name)
-                
-                with zipfile.ZipFile(temp_file.name, 'r') as zipf:
-                    zipf.extractall(local_adapter_path)
-                
-                # Cleanup temp file
-                os.unlink(temp_file.name)
-                
+            await asyncio.to_thread(self._restore_zip, s3_key, local_adapter_path, backup_metadata.get("backup_size_bytes"))
+            
         except Exception as e:
             logger.error(f"Error restoring adapters: {e}")
             raise
@@ -172,111 +948,105 @@ class AdapterPersistenceManager:
     async def restore_training_data_from_s3(self, local_training_data_path: str) -> None:
         """Restore training data from S3"""
         try:
-            s3_key = f"{self._get_s3_training_data_path()}training_data_backup.zip"
+            s3_key = f"{self._training_prefix}training_data_backup.zip"
             
-            # Check if backup exists
-            try:
-                self.s3_client.head_object(Bucket=self.s3_bucket, Key=s3_key)
-            except ClientError as e:
-                if e.response['Error']['Code'] == '404':
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"No training data backup found for user {self.user_id}, avatar {self.avatar_id}"
-                    )
-                raise
+            # Check if backup exists and which format it was written in
+            backup_metadata = await asyncio.to_thread(self._get_backup_metadata, self._training_prefix)
+            if not backup_metadata:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No training data backup found for user {self.user_id}, avatar {self.avatar_id}"
+                )
             
             # Create local directory if it doesn't exist
             os.makedirs(local_training_data_path, exist_ok=True)
             
+            if backup_metadata.get("format") == "raw":
+                await asyncio.to_thread(
+                    self._download_raw_backup,
+                    backup_metadata["archive_key"],
+                    local_training_data_path,
+                    self.settings.raw_backup_upload_workers
+                )
+                return
+            
+            if backup_metadata.get("format") == "tar.zst":
+                await asyncio.to_thread(self._restore_tar_zst, backup_metadata["archive_key"], local_training_data_path)
+                return
+            
             # Download and extract
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
-                self.s3_client.download_file(self.s3_bucket, s3_key, temp_file.name)
-                
-                with zipfile.ZipFile(temp_file.name, 'r') as zipf:
-                    zipf.extractall(local_training_data_path)
-                
-                # Cleanup temp file
-                os.unlink(temp_file.name)
-                
+            await asyncio.to_thread(self._restore_zip, s3_key, local_training_data_path, backup_metadata.get("backup_size_bytes"))
+            
         except Exception as e:
             logger.error(f"Error restoring training data: {e}")
             raise
     
     async def list_adapter_backups(self) -> List[Dict[str, Any]]:
         """List available adapter backups"""
-        backups = []
+        cache_key = (self.s3_bucket, self.user_id, self.avatar_id)
+        with _backup_list_cache_lock:
+            cached = _backup_list_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
         
         try:
-            # List adapter backups
-            adapter_prefix = self._get_s3_adapter_path()
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.s3_bucket,
-                Prefix=adapter_prefix
-            )
+            backups = await asyncio.to_thread(self._collect_backup_listing)
             
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    if obj['Key'].endswith('adapter_backup.zip'):
-                        # Try to get metadata
-                        metadata_key = obj['Key'].replace('adapter_backup.zip', 'backup_metadata.json')
-                        metadata = {}
-                        try:
-                            metadata_obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=metadata_key)
-                            metadata = json.loads(metadata_obj['Body'].read().decode('utf-8'))
-                        except:
-                            pass
-                        
-                        backups.append({
-                            "type": "adapters",
-                            "key": obj['Key'],
-                            "size": obj['Size'],
-                            "last_modified": obj['LastModified'].isoformat(),
-                            "metadata": metadata
-                        })
-            
-            # List training data backups
-            training_prefix = self._get_s3_training_data_path()
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.s3_bucket,
-                Prefix=training_prefix
-            )
+            with _backup_list_cache_lock:
+                _backup_list_cache[cache_key] = backups
             
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    if obj['Key'].endswith('training_data_backup.zip'):
-                        # Try to get metadata
-                        metadata_key = obj['Key'].replace('training_data_backup.zip', 'backup_metadata.json')
-                        metadata = {}
-                        try:
-                            metadata_obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=metadata_key)
-                            metadata = json.loads(metadata_obj['Body'].read().decode('utf-8'))
-                        except:
-                            pass
-                        
-                        backups.append({
-                            "type": "training_data",
-                            "key": obj['Key'],
-                            "size": obj['Size'],
-                            "last_modified": obj['LastModified'].isoformat(),
-                            "metadata": metadata
-                        })
-            
-            return backups
+            return list(backups)
             
         except Exception as e:
             logger.error(f"Error listing adapter backups: {e}")
             raise
 
+    def _collect_backup_listing(self) -> List[Dict[str, Any]]:
+        """List backup artifacts together with their metadata"""
+        backups = []
+        listed = []
+        
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        
+        # Backup artifacts share a name stem, so the prefix filter runs server-side
+        # and never pages through the training files stored under the same root
+        for backup_type, s3_prefix, artifact_stem in (
+            ("adapters", self._adapter_prefix, "adapter_backup"),
+            ("training_data", self._training_prefix, "training_data_backup"),
+        ):
+            pages = paginator.paginate(
+                Bucket=self.s3_bucket,
+                Prefix=f"{s3_prefix}{artifact_stem}",
+                PaginationConfig={"PageSize": 1000}
+            )
+            
+            for page in pages:
+                for obj in page.get('Contents', []):
+                    listed.append((s3_prefix, {
+                        "type": backup_type,
+                        "key": obj['Key'],
+                        "size": obj['Size'],
+                        "last_modified": obj['LastModified'].isoformat()
+                    }))
+        
+        # Every artifact under a prefix shares one metadata object, so fetch each
+        # distinct prefix once and issue those reads in parallel
+        metadata_by_prefix = self._get_backup_metadata_batch({prefix for prefix, _ in listed})
+        for s3_prefix, backup in listed:
+            backup["metadata"] = metadata_by_prefix[s3_prefix]
+            backups.append(backup)
+        
+        return backups
+
     async def adapter_exists(self) -> bool:
         """Check if adapter exists"""
         try:
-            adapter_key = f"{self._get_s3_adapter_path()}adapter_backup.zip"
-            self.s3_client.head_object(
-                Bucket=self.s3_bucket,
-                Key=adapter_key
-            )
-            return True
-        except Exception as e:
+            # Backup metadata is written for every backup format
+            adapter_key = f"{self._adapter_prefix}backup_metadata.json"
+            return await asyncio.to_thread(self._cached_head, adapter_key) is not None
+        except ClientError as e:
+            if e.response['Error']['Code'] in THROTTLE_ERROR_CODES:
+                raise
             logger.debug(f"Adapter check failed (this is normal for new adapters): {e}")
             return False
 
@@ -292,7 +1062,7 @@ class AdapterPersistenceManager:
     async def create_adapter(self, model_name: str = "meta-llama/Llama-3.2-1B-Instruct") -> Dict[str, Any]:
         """Create and save a new LoRA adapter configuration and weights."""
         try:
-            adapter_path = self._get_s3_adapter_path()
+            adapter_path = self._adapter_prefix
 
             # Check if adapter already exists
             if await self.adapter_exists():
@@ -308,55 +1078,8 @@ class AdapterPersistenceManager:
                 local_adapter_path = os.path.join(temp_dir, "adapters")
                 os.makedirs(local_adapter_path, exist_ok=True)
 
-                # Initialize adapter metadata
-                adapter_config = {
-                    "avatar_id": self.avatar_id,
-                    "created_at": datetime.now().isoformat(),
-                    "version": "1.0.0",
-                    "status": "untrained",
-                    "training_history": [],
-                    "model_name": model_name
-                }
-
-                # Save adapter metadata
-                config_path = os.path.join(local_adapter_path, "adapter_metadata.json")
-                with open(config_path, "w") as f:
-                    json.dump(adapter_config, f, indent=2)
-
-                # Load base model and tokenizer
-                model = AutoModelForCausalLM.from_pretrained(
-                    model_name,
-                    device_map="auto", 
-                    token=self.HF_TOKEN,
-                    local_files_only=True,  # ADD THIS - forces use of cached model
-                    cache_dir=os.getenv('TRANSFORMERS_CACHE')  # ADD THIS - explicit cache location
-                )
-                tokenizer = AutoTokenizer.from_pretrained(
-                    model_name, 
-                    token=self.HF_TOKEN,
-                    local_files_only=True,  # ADD THIS - forces use of cached model
-                    cache_dir=os.getenv('TRANSFORMERS_CACHE')  # ADD THIS - explicit cache location)
-                )
-                tokenizer.pad_token = tokenizer.eos_token
-
-                # Prepare model for training
-                model = prepare_model_for_kbit_training(model)
-
-                # Create LoRA config
-                lora_config = LoraConfig(
-                    r=16,
-                    lora_alpha=32,
-                    target_modules=["q_proj", "v_proj"],
-                    lora_dropout=0.1,
-                    bias="none",
-                    task_type="CAUSAL_LM"
-                )
-
-                # Attach and initialize LoRA adapter
-                peft_model = get_peft_model(model, lora_config)
-
-                # Save untrained adapter
-                peft_model.save_pretrained(local_adapter_path)
+                # Loading the base model is CPU/disk bound, keep it off the event loop
+                await asyncio.to_thread(self._initialize_adapter, local_adapter_path, model_name)
 
                 # Backup to S3
                 backup_metadata = await self.backup_adapters_to_s3(local_adapter_path)
@@ -375,10 +1098,59 @@ class AdapterPersistenceManager:
             raise HTTPException(status_code=500, detail=f"Failed to create adapter: {str(e)}")
 
 
+    def _initialize_adapter(self, local_adapter_path: str, model_name: str) -> None:
+        """Write adapter metadata and untrained LoRA weights to a local directory"""
+        # Heavy ML imports are deferred to adapter creation to keep startup fast
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+        from peft import LoraConfig, get_peft_model, prepare_model_for_kbit_training
+        
+        # Initialize adapter metadata
+        adapter_config = {
+            "avatar_id": self.avatar_id,
+            "created_at": datetime.now(),
+            "version": "1.0.0",
+            "status": "untrained",
+            "training_history": [],
+            "model_name": model_name
+        }
+
+        # Save adapter metadata
+        config_path = os.path.join(local_adapter_path, "adapter_metadata.json")
+        with open(config_path, "wb") as f:
+            f.write(orjson.dumps(adapter_config))
+
+        # Load base model and tokenizer
+        model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            device_map="auto", 
+            token=self.HF_TOKEN,
+            local_files_only=True,  # ADD THIS - forces use of cached model
+            cache_dir=os.getenv('TRANSFORMERS_CACHE')  # ADD THIS - explicit cache location
+        )
+        tokenizer = AutoTokenizer.from_pretrained(
+            model_name, 
+            token=self.HF_TOKEN,
+            local_files_only=True,  # ADD THIS - forces use of cached model
+            cache_dir=os.getenv('TRANSFORMERS_CACHE')  # ADD THIS - explicit cache location)
+        )
+        tokenizer.pad_token = tokenizer.eos_token
+
+        # Prepare model for training
+        model = prepare_model_for_kbit_training(model)
+
+        # Create LoRA config
+        lora_config = LoraConfig(**ADAPTER_LORA_SETTINGS)
+
+        # Attach and initialize LoRA adapter
+        peft_model = get_peft_model(model, lora_config)
+
+        # Save untrained adapter
+        peft_model.save_pretrained(local_adapter_path)
+
     async def get_adapter_info(self) -> Dict[str, Any]:
         """Get adapter information"""
         try:
-            adapter_path = self._get_s3_adapter_path()
+            adapter_path = self._adapter_prefix
             
             if not await self.adapter_exists():
                 return {
@@ -389,29 +1161,20 @@ class AdapterPersistenceManager:
                 }
             
             # Get adapter metadata
-            metadata_key = f"{adapter_path}backup_metadata.json"
-            try:
-                metadata_obj = self.s3_client.get_object(
-                    Bucket=self.s3_bucket,
-                    Key=metadata_key
-                )
-                metadata = json.loads(metadata_obj['Body'].read().decode('utf-8'))
-            except:
-                metadata = {}
+            metadata = await asyncio.to_thread(self._get_backup_metadata, adapter_path)
             
-            # Try to get adapter config
+            # Try to get adapter config, falling back to the backup itself for adapters
+            # backed up before the config was stored as its own object
             try:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    local_adapter_path = os.path.join(temp_dir, "adapters")
-                    await self.restore_adapters_from_s3(local_adapter_path)
-                    
-                    config_path = os.path.join(local_adapter_path, "adapter_config.json")
-                    if os.path.exists(config_path):
-                        with open(config_path, 'r') as f:
-                            adapter_config = json.load(f)
-                        metadata["adapter_config"] = adapter_config
-            except:
-                pass
+                config_bytes = await asyncio.to_thread(self._read_adapter_config, metadata)
+                if config_bytes is not None:
+                    metadata["adapter_config"] = orjson.loads(config_bytes)
+            except ClientError as e:
+                if e.response['Error']['Code'] in THROTTLE_ERROR_CODES:
+                    raise
+                logger.warning(f"Could not read adapter config: {e}")
+            except (zipfile.BadZipFile, orjson.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable adapter config: {e}")
             
             return {
                 "status": "found",
@@ -424,82 +1187,187 @@ class AdapterPersistenceManager:
             logger.error(f"Error getting adapter info: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to get adapter info: {str(e)}")
 
+    async def export_adapter_archive(self, archive_path: str) -> None:
+        """Write the adapter backup to a local zip file, assembling it for raw backups"""
+        await asyncio.to_thread(self._write_adapter_archive, archive_path)
+
+    def _write_adapter_archive(self, archive_path: str) -> None:
+        """Download or assemble the adapter backup zip"""
+        adapter_path = self._adapter_prefix
+        backup_metadata = self._get_backup_metadata(adapter_path)
+        
+        if backup_metadata.get("format") != "raw":
+            self.s3_client.download_file(
+                self.s3_bucket, f"{adapter_path}adapter_backup.zip", archive_path,
+                Config=self.transfer_config
+            )
+            return
+        
+        manifest_obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=backup_metadata["archive_key"])
+        manifest = orjson.loads(manifest_obj['Body'].read())
+        
+        # Stream each raw object straight into a stored (uncompressed) zip entry
+        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_STORED) as zipf:
+            for arcname in manifest["files"]:
+                obj = self.s3_client.get_object(Bucket=self.s3_bucket, Key=f"{manifest['prefix']}{arcname}")
+                with zipf.open(arcname, 'w') as entry:
+                    shutil.copyfileobj(obj['Body'], entry)
+
     async def delete_adapter(self) -> Dict[str, Any]:
         """Delete an adapter and all related data"""
         try:
-            adapter_path = self._get_s3_adapter_path()
+            adapter_path = self._adapter_prefix
             
-            # List all objects with the adapter prefix
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.s3_bucket,
-                Prefix=adapter_path
-            )
+            # Delete every object under the adapter prefix, page by page
+            deleted_count = await asyncio.to_thread(self._delete_prefix, adapter_path)
+            self._forget_training_metadata()
             
-            if 'Contents' not in response:
+            if not deleted_count:
                 raise HTTPException(
                     status_code=404,
                     detail=f"No adapter found for user {self.user_id}, avatar {self.avatar_id}"
                 )
             
-            # Delete all adapter-related objects
-            objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
-            
-            if objects_to_delete:
-                self.s3_client.delete_objects(
-                    Bucket=self.s3_bucket,
-                    Delete={'Objects': objects_to_delete}
-                )
-                
-                logger.info(f"Deleted {len(objects_to_delete)} adapter objects for user {self.user_id}, avatar {self.avatar_id}")
+            self._invalidate_backup_listing()
+            logger.info(f"Deleted {deleted_count} adapter objects for user {self.user_id}, avatar {self.avatar_id}")
             
             return {
                 "status": "success",
                 "message": f"Adapter deleted for user {self.user_id}, avatar {self.avatar_id}",
-                "deleted_objects": len(objects_to_delete)
+                "deleted_objects": deleted_count
             }
             
         except Exception as e:
             logger.error(f"Error deleting adapter: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to delete adapter: {str(e)}")
 
+    def _delete_prefix(self, s3_prefix: str, max_workers: int = DELETE_WORKERS) -> int:
+        """Delete all objects under a prefix, returning how many were deleted"""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        
+        # Keys stream from the listing pages straight into the delete batches
+        return self._delete_keys(
+            (obj['Key']
+             for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=s3_prefix)
+             for obj in page.get('Contents', [])),
+            max_workers=max_workers
+        )
+
+    def _delete_keys(self, keys: Iterable[str], max_workers: int = DELETE_WORKERS) -> int:
+        """Delete keys with concurrent delete_objects batches, returning how many were deleted"""
+        def delete_batch(batch: List[Dict[str, str]]) -> int:
+            response = self.s3_client.delete_objects(
+                Bucket=self.s3_bucket,
+                Delete={'Objects': batch, 'Quiet': True}
+            )
+            errors = response.get('Errors', [])
+            if errors:
+                raise RuntimeError(f"Failed to delete {len(errors)} objects, first: {errors[0].get('Key')} ({errors[0].get('Code')})")
+            return len(batch)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            batch = []
+            for key in keys:
+                batch.append({'Key': key})
+                if len(batch) == DELETE_BATCH_SIZE:
+                    futures.append(executor.submit(delete_batch, batch))
+                    batch = []
+            if batch:
+                futures.append(executor.submit(delete_batch, batch))
+            return sum(future.result() for future in futures)
+
     # Training data methods
     async def upload_training_file(self, filename: str, file_content: bytes, 
                                  content_type: str = 'application/octet-stream',
                                  use_for_training: bool = True) -> Dict[str, Any]:
         """Upload a training data file"""
+        results = await self.upload_training_files([(filename, file_content, content_type, use_for_training)])
+        return results[0]
+
+    async def upload_training_files(self, files: List[tuple]) -> List[Dict[str, Any]]:
+        """Upload (filename, content, content type, use for training) tuples with one metadata write"""
         try:
-            training_data_path = self._get_s3_training_data_path()
+            # Repeated names would race to one key and leave object and record disagreeing
+            filenames = [file[0] for file in files]
+            if len(set(filenames)) != len(filenames):
+                duplicates = sorted({filename for filename in filenames if filenames.count(filename) > 1})
+                raise HTTPException(status_code=400, detail=f"Duplicate filenames in upload batch: {', '.join(duplicates)}")
             
-            # Upload file to S3
-            file_key = f"{training_data_path}{filename}"
+            training_data_path = self._training_prefix
+            upload_timestamp = datetime.now().isoformat()
             
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket,
-                Key=file_key,
-                Body=file_content,
-                ContentType=content_type,
-                Metadata={
-                    'user_id': self.user_id,
-                    'avatar_id': self.avatar_id,
-                    'upload_timestamp': datetime.now().isoformat(),
-                    'original_filename': filename,
-                    'use_for_training': str(use_for_training)
-                }
-            )
+            compress = self.settings.zstd_training_uploads
             
-            # Update metadata.json
-            await self._update_training_metadata(filename, use_for_training)
+            def upload(file: tuple) -> Tuple[str, str, int]:
+                filename, file_content, content_type, use_for_training = file
+                file_key = f"{training_data_path}{filename}"
+                
+                # Text corpora shrink several-fold; compressors are not shared across threads
+                content_encoding = 'identity'
+                body = file_content
+                encoding_args = {}
+                if compress and os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTS:
+                    content_encoding = 'zstd'
+                    body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(file_content)
+                    encoding_args['ContentEncoding'] = content_encoding
+                
+                self.s3_client.put_object(
+                    Bucket=self.s3_bucket,
+                    Key=file_key,
+                    Body=body,
+                    ContentType=content_type,
+                    **encoding_args,
+                    Metadata={
+                        'user_id': self.user_id,
+                        'avatar_id': self.avatar_id,
+                        'upload_timestamp': upload_timestamp,
+                        'original_filename': filename,
+                        'use_for_training': str(use_for_training)
+                    }
+                )
+                self._forget_head(file_key)
+                return file_key, content_encoding, len(body)
             
-            logger.info(f"Uploaded training file {filename} for user {self.user_id}, avatar {self.avatar_id}")
+            def upload_all() -> List[Tuple[str, str, int]]:
+                if len(files) == 1:
+                    return [upload(files[0])]
+                with ThreadPoolExecutor(max_workers=min(TRAINING_UPLOAD_WORKERS, len(files) or 1)) as executor:
+                    return list(executor.map(upload, files))
             
-            return {
-                "status": "success",
-                "message": f"File {filename} uploaded successfully",
-                "file_size": len(file_content),
-                "use_for_training": use_for_training,
-                "s3_key": file_key
-            }
+            # Upload file bodies to S3 concurrently
+            uploaded = await asyncio.to_thread(upload_all)
+            
+            # Update metadata.json once for the whole batch; size is always the original length
+            await self._update_training_records({
+                filename: {
+                    "use_for_training": use_for_training,
+                    "content_type": content_type,
+                    "size": len(file_content),
+                    "upload_timestamp": upload_timestamp,
+                    "s3_key": file_key,
+                    "content_encoding": content_encoding,
+                    "stored_size": stored_size
+                }
+                for (filename, file_content, content_type, use_for_training), (file_key, content_encoding, stored_size)
+                in zip(files, uploaded)
+            })
+            
+            results = []
+            for (filename, file_content, _, use_for_training), (file_key, _, _) in zip(files, uploaded):
+                logger.info(f"Uploaded training file {filename} for user {self.user_id}, avatar {self.avatar_id}")
+                results.append({
+                    "status": "success",
+                    "message": f"File {filename} uploaded successfully",
+                    "file_size": len(file_content),
+                    "use_for_training": use_for_training,
+                    "s3_key": file_key
+                })
+            
+            return results
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error uploading training data: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to upload training data: {str(e)}")
@@ -507,54 +1375,50 @@ class AdapterPersistenceManager:
     async def list_training_files(self, training_only: Optional[bool] = None) -> List[Dict[str, Any]]:
         """List training data files with optional filtering"""
         try:
-            training_data_path = self._get_s3_training_data_path()
-            
-            # Get metadata
-            training_metadata = await self._get_training_metadata()
+            training_data_path = self._training_prefix
             
-            # List files in training data directory
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.s3_bucket,
-                Prefix=training_data_path
+            # Every stored object is listed, with or without a metadata record; fetch
+            # metadata and the listing concurrently rather than one after the other
+            training_metadata, objects = await asyncio.gather(
+                self._get_training_metadata(),
+                asyncio.to_thread(self._list_objects, training_data_path)
             )
+            entries = [
+                (os.path.basename(obj['Key']), obj['Key'], obj['Size'], obj['LastModified'])
+                for obj in objects
+                # Skip directory-like objects
+                if not obj['Key'].endswith('/')
+            ]
             
             files_list = []
             
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    # Skip directory-like objects
-                    if obj['Key'].endswith('/'):
+            for filename, s3_key, file_size, last_modified in entries:
+                file_record = training_metadata.get(filename, False)
+                use_for_training = uses_for_training(file_record)
+                if not isinstance(file_record, dict):
+                    file_record = {}
+                
+                # Compressed uploads report their original size, whichever path produced the entry
+                if 'stored_size' in file_record and 'size' in file_record:
+                    file_size = file_record['size']
+                
+                # Apply training_only filter
+                if training_only is not None:
+                    if training_only and not use_for_training:
                         continue
-                    
-                    filename = os.path.basename(obj['Key'])
-                    use_for_training = training_metadata.get(filename, False)
-                    
-                    # Apply training_only filter
-                    if training_only is not None:
-                        if training_only and not use_for_training:
-                            continue
-                        elif not training_only and use_for_training:
-                            continue
-                    
-                    # Get file metadata from S3 object metadata
-                    try:
-                        head_response = self.s3_client.head_object(
-                            Bucket=self.s3_bucket,
-                            Key=obj['Key']
-                        )
-                        file_metadata = head_response.get('Metadata', {})
-                    except:
-                        file_metadata = {}
-                    
-                    files_list.append({
-                        "filename": filename,
-                        "use_for_training": use_for_training,
-                        "file_size": obj['Size'],
-                        "last_modified": obj['LastModified'],
-                        "content_type": file_metadata.get('content-type', 'unknown'),
-                        "upload_timestamp": file_metadata.get('upload_timestamp'),
-                        "s3_key": obj['Key']
-                    })
+                    elif not training_only and use_for_training:
+                        continue
+                
+                files_list.append({
+                    "filename": filename,
+                    "use_for_training": use_for_training,
+                    "file_size": file_size,
+                    "last_modified": last_modified,
+                    "content_type": file_record.get('content_type', 'unknown'),
+                    "content_encoding": file_record.get('content_encoding', 'identity'),
+                    "upload_timestamp": file_record.get('upload_timestamp'),
+                    "s3_key": s3_key
+                })
             
             logger.info(f"Listed {len(files_list)} training data files for user {self.user_id}, avatar {self.avatar_id}")
             
@@ -568,34 +1432,308 @@ class AdapterPersistenceManager:
         """Get list of files marked for training"""
         try:
             training_metadata = await self._get_training_metadata()
-            return [filename for filename, use_for_training in training_metadata.items() if use_for_training]
-        except Exception as e:
+            return [filename for filename, entry in training_metadata.items() if uses_for_training(entry)]
+        except ClientError as e:
+            if e.response['Error']['Code'] in THROTTLE_ERROR_CODES:
+                raise
             logger.warning(f"Error getting training files: {e}")
             return []
 
+    async def reconcile_training_metadata(self) -> Dict[str, Any]:
+        """Repair metadata.json records against a full listing of the training data prefix"""
+        try:
+            training_metadata = await self._get_training_metadata(force_refresh=True)
+            objects = await asyncio.to_thread(self._list_objects, self._training_prefix)
+            
+            # Uploaded files sit directly under the prefix; backup archives are not tracked
+            stored = {
+                obj['Key'][len(self._training_prefix):]: obj
+                for obj in objects
+                if '/' not in obj['Key'][len(self._training_prefix):]
+            }
+            
+            updates = {}
+            for filename, entry in training_metadata.items():
+                obj = stored.get(filename)
+                if obj is None:
+                    updates[filename] = None
+                    continue
+                
+                # Compressed uploads keep the original length in size and the object's in stored_size
+                size_field = 'stored_size' if isinstance(entry, dict) and 'stored_size' in entry else 'size'
+                if (not isinstance(entry, dict) or entry.get('s3_key') != obj['Key']
+                        or entry.get(size_field) != obj['Size'] or not entry.get('upload_timestamp')):
+                    # Legacy records gain the object's LastModified so they are complete for listings
+                    updates[filename] = {
+                        "use_for_training": uses_for_training(entry),
+                        size_field: obj['Size'],
+                        "s3_key": obj['Key'],
+                        "upload_timestamp": (entry.get('upload_timestamp') if isinstance(entry, dict) else None)
+                                            or obj['LastModified'].isoformat()
+                    }
+            
+            if updates:
+                await self._update_training_records(updates)
+            
+            removed = [filename for filename, fields in updates.items() if fields is None]
+            logger.info(f"Reconciled training metadata for user {self.user_id}, avatar {self.avatar_id}: "
+                        f"{len(updates) - len(removed)} updated, {len(removed)} removed")
+            
+            return {
+                "status": "success",
+                "updated_records": len(updates) - len(removed),
+                "removed_records": removed
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error reconciling training metadata: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to reconcile training metadata: {str(e)}")
+
+    async def download_training_files(self, filenames: List[str], local_path: str,
+                                      max_workers: int = TRAINING_DOWNLOAD_WORKERS) -> List[str]:
+        """Download training files concurrently into a local directory, returning the ones that succeeded"""
+        training_metadata = await self._get_training_metadata()
+        
+        def download(filename: str) -> Optional[str]:
+            s3_key = f"{self._training_prefix}{filename}"
+            local_file_path = os.path.join(local_path, os.path.basename(filename))
+            entry = training_metadata.get(filename)
+            
+            try:
+                if isinstance(entry, dict) and entry.get('content_encoding') == 'zstd':
+                    # Compressed uploads are decoded while streaming to disk
+                    response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=s3_key)
+                    with open(local_file_path, 'wb') as f:
+                        zstandard.ZstdDecompressor().copy_stream(
+                            response['Body'], f,
+                            read_size=TRAINING_DOWNLOAD_CHUNK_SIZE,
+                            write_size=TRAINING_DOWNLOAD_CHUNK_SIZE
+                        )
+                else:
+                    self.s3_client.download_file(self.s3_bucket, s3_key, local_file_path, Config=self.transfer_config)
+            except Exception as e:
+                logger.warning(f"Failed to download training file {filename}: {e}")
+                return None
+            
+            return filename
+        
+        def download_all() -> List[str]:
+            os.makedirs(local_path, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(filenames) or 1)) as executor:
+                return [filename for filename in executor.map(download, filenames) if filename]
+        
+        downloaded = await asyncio.to_thread(download_all)
+        logger.info(f"Downloaded {len(downloaded)}/{len(filenames)} training files for user {self.user_id}, avatar {self.avatar_id}")
+        
+        return downloaded
+
+    async def get_training_file_download_urls_bulk(self, filenames: List[str],
+                                                   expires_in: int = TRAINING_DOWNLOAD_URL_EXPIRES) -> Dict[str, str]:
+        """Presign GET URLs for several training files in one pass"""
+        def sign_all() -> Dict[str, str]:
+            # Presigning is local; one thread reuses the client's signer for every key
+            generate = self.s3_client.generate_presigned_url
+            return {
+                filename: generate(
+                    'get_object',
+                    Params={'Bucket': self.s3_bucket, 'Key': f"{self._training_prefix}{filename}"},
+                    ExpiresIn=expires_in
+                )
+                for filename in filenames
+            }
+        
+        return await asyncio.to_thread(sign_all)
+
+    async def get_training_file_download_url(self, filename: str,
+                                             expires_in: int = TRAINING_DOWNLOAD_URL_EXPIRES) -> Dict[str, Any]:
+        """Presign a download URL for a single training file"""
+        try:
+            training_metadata = await self._get_training_metadata()
+            entry = training_metadata.get(filename)
+            if entry is None:
+                raise HTTPException(status_code=404, detail=f"Training file {filename} not found")
+            
+            urls = await self.get_training_file_download_urls_bulk([filename], expires_in)
+            
+            return {
+                "filename": filename,
+                "download_url": urls[filename],
+                "expires_in": expires_in,
+                "content_encoding": entry.get('content_encoding', 'identity') if isinstance(entry, dict) else 'identity'
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating download URL for {filename}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to generate download URL: {str(e)}")
+
+    async def delete_non_training_files(self) -> Dict[str, Any]:
+        """Delete all training data files not marked for training"""
+        try:
+            training_metadata = await self._get_training_metadata(force_refresh=True)
+            
+            # Only files with a metadata record are candidates, so backup archives under the prefix are kept
+            filenames = [filename for filename, entry in training_metadata.items() if not uses_for_training(entry)]
+            
+            deleted_count = await asyncio.to_thread(
+                self._delete_keys,
+                (f"{self._training_prefix}{filename}" for filename in filenames)
+            )
+            for filename in filenames:
+                self._forget_head(f"{self._training_prefix}{filename}")
+            
+            if filenames:
+                await self._update_training_records({filename: None for filename in filenames})
+            
+            logger.info(f"Deleted {deleted_count} non-training files for user {self.user_id}, avatar {self.avatar_id}")
+            
+            return {
+                "status": "success",
+                "message": f"Deleted {deleted_count} files not marked for training",
+                "deleted_count": deleted_count,
+                "deleted_files": filenames
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error deleting non-training files: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to delete non-training files: {str(e)}")
+
     # Helper methods
-    async def _get_training_metadata(self) -> Dict[str, bool]:
+    def _forget_training_metadata(self) -> None:
+        """Drop the cached training metadata of this avatar"""
+        with _training_metadata_cache_lock:
+            _training_metadata_cache.pop((self.s3_bucket, f"{self._metadata_prefix}metadata.json"), None)
+
+    async def _get_training_metadata(self, force_refresh: bool = False) -> Dict[str, Any]:
         """Get training metadata from S3"""
-        metadata_key = f"{self._get_s3_metadata_path()}metadata.json"
+        cache_key = (self.s3_bucket, f"{self._metadata_prefix}metadata.json")
+        if not force_refresh:
+            with _training_metadata_cache_lock:
+                cached = _training_metadata_cache.get(cache_key)
+            if cached is not None:
+                return cached[1]
+        
+        try:
+            etag, metadata = await asyncio.to_thread(self._read_training_metadata)
+            if etag:
+                with _training_metadata_cache_lock:
+                    _training_metadata_cache[cache_key] = (etag, metadata)
+            return metadata
+        except ClientError as e:
+            if e.response['Error']['Code'] in THROTTLE_ERROR_CODES:
+                raise
+            logger.warning(f"Error reading training metadata: {e}")
+            return {}
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Ignoring malformed training metadata: {e}")
+            return {}
+
+    def _read_training_metadata(self) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Get training metadata together with its ETag, (None, {}) if it does not exist yet"""
+        metadata_key = f"{self._metadata_prefix}metadata.json"
         
         try:
             metadata_obj = self.s3_client.get_object(
                 Bucket=self.s3_bucket,
                 Key=metadata_key
             )
-            return json.loads(metadata_obj['Body'].read().decode('utf-8'))
-        except:
-            return {}
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None, {}
+            raise
+        
+        return metadata_obj['ETag'], orjson.loads(metadata_obj['Body'].read())
 
-    async def _update_training_metadata(self, filename: str, use_for_training: bool) -> None:
+    def _list_objects(self, s3_prefix: str) -> List[Dict[str, Any]]:
+        """List every object under a prefix across all listing pages"""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        return [
+            obj
+            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=s3_prefix)
+            for obj in page.get('Contents', [])
+        ]
+
+    async def _update_training_metadata(self, filename: str, use_for_training: bool,
+                                        content_type: Optional[str] = None,
+                                        size: Optional[int] = None,
+                                        upload_timestamp: Optional[str] = None) -> None:
         """Update training metadata for a specific file"""
-        metadata = await self._get_training_metadata()
-        metadata[filename] = use_for_training
+        fields = {
+            "use_for_training": use_for_training,
+            "content_type": content_type,
+            "size": size,
+            "upload_timestamp": upload_timestamp
+        }
+        await self._update_training_records({filename: fields})
+
+    async def _update_training_records(self, updates: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Merge per-file records into metadata.json with a conditional read-modify-write, None drops a record"""
+        metadata_key = f"{self._metadata_prefix}metadata.json"
+        cache_key = (self.s3_bucket, metadata_key)
         
-        metadata_key = f"{self._get_s3_metadata_path()}metadata.json"
-        self.s3_client.put_object(
-            Bucket=self.s3_bucket,
-            Key=metadata_key,
-            Body=json.dumps(metadata, indent=2),
-            ContentType='application/json'
-        )
\ No newline at end of file
+        # The first attempt writes over the cached version without a GET; if another
+        # writer got there first the precondition fails and later attempts re-read
+        with _training_metadata_cache_lock:
+            cached = _training_metadata_cache.get(cache_key)
+        
+        for attempt in range(1, METADATA_WRITE_ATTEMPTS + 1):
+            if attempt == 1 and cached is not None:
+                etag, metadata = cached[0], dict(cached[1])
+            else:
+                etag, metadata = await asyncio.to_thread(self._read_training_metadata)
+            
+            # Listings are served from these records alone, so keep whatever is not being replaced
+            changed = False
+            for filename, fields in updates.items():
+                if fields is None:
+                    if filename in metadata:
+                        del metadata[filename]
+                        changed = True
+                    continue
+                
+                record = metadata.get(filename)
+                if not isinstance(record, dict):
+                    record = {}
+                merged = {**record, **{name: value for name, value in fields.items() if value is not None}}
+                if merged != metadata.get(filename):
+                    metadata[filename] = merged
+                    changed = True
+            
+            # Idempotent updates (e.g. re-setting the same training flag) skip the write,
+            # but only once S3 itself confirms it; the cached copy may be behind
+            if not changed:
+                if attempt == 1 and cached is not None:
+                    continue
+                return
+            
+            # Only write over the version that was read; a concurrent writer forces a re-read
+            condition = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+            try:
+                put_response = await asyncio.to_thread(
+                    self.s3_client.put_object,
+                    Bucket=self.s3_bucket,
+                    Key=metadata_key,
+                    Body=orjson.dumps(metadata),
+                    ContentType='application/json',
+                    **condition
+                )
+                with _training_metadata_cache_lock:
+                    _training_metadata_cache[cache_key] = (put_response['ETag'], metadata)
+                return
+            except ClientError as e:
+                error_code = e.response['Error']['Code']
+                if error_code in ('NoSuchKey', '404') and attempt == 1 and cached is not None:
+                    # metadata.json was deleted behind the cache; re-read without it
+                    self._forget_training_metadata()
+                    cached = None
+                    continue
+                if error_code not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                    raise
+                logger.warning(f"Training metadata changed concurrently, retrying ({attempt}/{METADATA_WRITE_ATTEMPTS})")
+        
+        raise HTTPException(status_code=409, detail="Training metadata is being updated concurrently, try again")
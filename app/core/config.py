@@ -1,25 +1,31 @@
 ## app/core/config.py
-import os
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 class Settings(BaseSettings):
     # AWS Configuration
-    aws_access_key_id: Optional[str] = os.getenv("AWS_ACCESS_KEY_ID")
-    aws_secret_access_key: Optional[str] = os.getenv("AWS_SECRET_ACCESS_KEY")
-    aws_region: str = os.getenv("AWS_REGION", "us-east-1")
-    s3_bucket_name: str = os.getenv("S3_BUCKET_NAME", "lora-adapters-bucket")
+    aws_access_key_id: Optional[str] = None
+    aws_secret_access_key: Optional[str] = None
+    aws_region: str = "us-east-1"
+    s3_bucket_name: str = "lora-adapters-bucket"
     
     # Model Configuration
     base_model_name: str = "meta-llama/Llama-3.2-1B-Instruct"
     
+    # Backup Configuration
+    raw_training_data_backup: bool = False
+    zstd_training_data_backup: bool = True
+    zstd_training_uploads: bool = False
+    raw_backup_upload_workers: int = 64
+    s3_transfer_max_concurrency: int = 16
+    s3_max_pool_connections: int = 64
+    
     # API Configuration
-    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    debug: bool = False
     
     USER_ID: str
     HF_TOKEN: str
     
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
 settings = Settings()
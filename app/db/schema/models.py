@@ -1,64 +1,37 @@
 
 ## app/db/schema/models.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, List, Any
 from datetime import datetime
-class TrainingDataMetadata(BaseModel):
-    file_key: str
-    use_for_training: bool = True
-    upload_timestamp: datetime
-    file_size: Optional[int] = None
-    content_type: Optional[str] = None
-
-class AdapterConfig(BaseModel):
-    user_id: str
-    avatar_id: str
-    adapter_name: str
-    created_at: datetime
-    last_trained: Optional[datetime] = None
-    training_status: str = "not_trained"  # not_trained, training, completed, failed
-
-class TrainingRequest(BaseModel):
-    user_id: str
-    avatar_id: str
-    training_params: Optional[Dict] = None
-
-class S3UploadRequest(BaseModel):
-    user_id: str
-    avatar_id: str
-    file_name: str
-    use_for_training: bool = True
-
-class MetadataUpdate(BaseModel):
-    use_for_training: bool
 
+# Response models are built once and never mutated
+RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, extra='ignore')
 
 ### Persistence.py Models
 
 # Response models
 class AdapterBackupResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
     success: bool
     message: str
     backup_info: Dict[str, Any]
 
 class AdapterRestoreResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
     success: bool
     message: str
 
 class AdapterListBackupsResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
     backups: List[Dict[str, Any]]
     count: int
 
 
-###
-# Add these model definitions to your existing db/schema/models.py file
-
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+### Adapter and Training Models
 
 class AdapterConfig(BaseModel):
     """Configuration for LoRA adapter"""
+    model_config = RESPONSE_MODEL_CONFIG
     user_id: str
     avatar_id: str
     adapter_name: str
@@ -89,6 +62,7 @@ class MetadataUpdate(BaseModel):
 
 class TrainingDataMetadata(BaseModel):
     """Metadata for training data files"""
+    model_config = RESPONSE_MODEL_CONFIG
     filename: str
     use_for_training: bool
     file_size: int
@@ -99,6 +73,7 @@ class TrainingDataMetadata(BaseModel):
 
 class AdapterStatus(BaseModel):
     """Status information for an adapter"""
+    model_config = RESPONSE_MODEL_CONFIG
     user_id: str
     avatar_id: str
     exists: bool
@@ -110,6 +85,7 @@ class AdapterStatus(BaseModel):
 
 class TrainingResult(BaseModel):
     """Result of a training operation"""
+    model_config = RESPONSE_MODEL_CONFIG
     status: str
     message: str
     training_files_used: List[str]
@@ -119,6 +95,7 @@ class TrainingResult(BaseModel):
 
 class FileUploadResponse(BaseModel):
     """Response for file upload operations"""
+    model_config = RESPONSE_MODEL_CONFIG
     status: str
     message: str
     filename: str
@@ -128,6 +105,7 @@ class FileUploadResponse(BaseModel):
 
 class DeleteResponse(BaseModel):
     """Response for delete operations"""
+    model_config = RESPONSE_MODEL_CONFIG
     status: str
     message: str
     deleted_items: List[str]
@@ -135,6 +113,7 @@ class DeleteResponse(BaseModel):
 
 class DownloadResponse(BaseModel):
     """Response for download operations"""
+    model_config = RESPONSE_MODEL_CONFIG
     status: str
     filename: str
     download_url: str
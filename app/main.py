@@ -4,6 +4,7 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
 
 from core.config import settings
 # Import your existing routers
@@ -12,6 +13,7 @@ from core.logging import logger
 from service.persistence_service import (
     initialize_s3_client,
     get_s3_client,
+    check_s3_connection,
 )
 
 @asynccontextmanager
@@ -76,12 +78,8 @@ async def health_check():
     try:
         s3_client = get_s3_client()
         
-        # Test S3 connection
-        s3_status = "connected"
-        try:
-            s3_client.head_bucket(Bucket=settings.s3_bucket_name)
-        except Exception as e:
-            s3_status = f"disconnected: {str(e)}"
+        # Test S3 connection, at most once per TTL window
+        s3_status = await asyncio.to_thread(check_s3_connection, s3_client)
         
         return {
             "status": "healthy",
@@ -1,6 +1,6 @@
 # service/persistence_service.py
 
-import boto3
+import time
 from fastapi import HTTPException
 from classes.AdapterPersistenceManager import AdapterPersistenceManager
 from core.logging import logger
@@ -9,19 +9,36 @@ from core.config import settings
 # Global variables to hold managers
 s3_client_instance = None
 
+# Health checks reuse a successful bucket probe for this many seconds
+HEAD_BUCKET_TTL = 30
+_last_head_ok = 0.0
+
 def initialize_s3_client():
     """Initialize S3 client - called during app startup"""
-    global s3_client_instance
+    global s3_client_instance, _last_head_ok
+    
+    # boto3 loads its service models on import, so defer it until the client is needed
+    import boto3
+    from botocore.config import Config
     
     try:
         s3_client = boto3.client(
             's3',
             aws_access_key_id=settings.aws_access_key_id,
             aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region
+            region_name=settings.aws_region,
+            # Backups fan out across threads; the default pool of 10 would serialize them
+            config=Config(
+                max_pool_connections=settings.s3_max_pool_connections,
+                retries={'max_attempts': 5, 'mode': 'adaptive'},
+                tcp_keepalive=True,
+                # Bucket-in-hostname requests avoid the legacy path-style redirect hop
+                s3={'addressing_style': 'virtual'}
+            )
         )
         # Test S3 connection
         s3_client.head_bucket(Bucket=settings.s3_bucket_name)
+        _last_head_ok = time.monotonic()
         logger.info(f"S3 connection successful to bucket: {settings.s3_bucket_name}")
         s3_client_instance = s3_client
         return s3_client
@@ -47,6 +64,21 @@ def get_s3_client():
     
     return s3_client_instance
 
+def check_s3_connection(s3_client) -> str:
+    """Probe the S3 bucket, reusing a recent successful probe"""
+    global _last_head_ok
+    
+    if time.monotonic() - _last_head_ok < HEAD_BUCKET_TTL:
+        return "connected"
+    
+    try:
+        s3_client.head_bucket(Bucket=settings.s3_bucket_name)
+    except Exception as e:
+        return f"disconnected: {str(e)}"
+    
+    _last_head_ok = time.monotonic()
+    return "connected"
+
 def get_adapter_persistence_manager(avatar_id: str) -> AdapterPersistenceManager:
     """Get adapter persistence manager instance with dynamic user_id from environment"""
     user_id = settings.USER_ID
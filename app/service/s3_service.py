@@ -2,16 +2,67 @@
 S3 Service for handling S3 operations
 """
 
-import json
+import io
+import hashlib
+import orjson
 import tempfile
-from typing import Dict, Any, List, Optional, BinaryIO
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, BinaryIO, Tuple, Union
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import threading
 import os
 
 from botocore.exceptions import ClientError
+from cachetools import TTLCache
 from core.logging import logger
 from core.config import settings
 
+if TYPE_CHECKING:
+    from boto3.s3.transfer import TransferConfig
+
+# Concurrent GETs when restoring a backup; each download is bound by S3 round-trip time
+DOWNLOAD_WORKERS = 32
+
+# Concurrent uploads when creating a backup; files above the threshold are also
+# split into parts that upload in parallel
+UPLOAD_WORKERS = 16
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+# Largest number of keys a single delete_objects request accepts
+DELETE_BATCH_SIZE = 1000
+
+# HEAD responses are reused for a short window; only hits are cached, and
+# writes and deletes made through this service evict their keys
+HEAD_CACHE_TTL = 60
+_head_cache = TTLCache(maxsize=1024, ttl=HEAD_CACHE_TTL)
+_head_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _get_transfer_config() -> "TransferConfig":
+    """Transfer config for multipart uploads of large backup files"""
+    from boto3.s3.transfer import TransferConfig
+    
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_THRESHOLD,
+        max_concurrency=10
+    )
+
+
+def _s3_etag(file_content: Union[bytes, BinaryIO]) -> str:
+    """ETag S3 assigns to content sent through upload_file, MD5 or multipart MD5-of-MD5s"""
+    if isinstance(file_content, (bytes, bytearray)):
+        return hashlib.md5(file_content).hexdigest()
+    
+    part_digests = [
+        hashlib.md5(chunk).digest()
+        for chunk in iter(lambda: file_content.read(MULTIPART_THRESHOLD), b'')
+    ]
+    return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+
 class S3Service:
     """Service for S3 operations"""
     
@@ -28,11 +79,11 @@ class S3Service:
         return self._s3_client
     
     def upload_file(self, 
-                   file_content: bytes, 
+                   file_content: Union[bytes, BinaryIO], 
                    s3_key: str, 
                    content_type: str = 'application/octet-stream',
                    metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
-        """Upload file content to S3"""
+        """Upload file content or a seekable binary file object to S3"""
         
         try:
             extra_args = {
@@ -42,12 +93,29 @@ class S3Service:
             if metadata:
                 extra_args['Metadata'] = metadata
             
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=file_content,
-                **extra_args
-            )
+            if isinstance(file_content, (bytes, bytearray)) and len(file_content) <= MULTIPART_THRESHOLD:
+                size = len(file_content)
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=file_content,
+                    **extra_args
+                )
+            else:
+                # Large payloads and open files go up in parts, read as they are sent
+                fileobj = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
+                start = fileobj.tell()
+                size = fileobj.seek(0, io.SEEK_END) - start
+                fileobj.seek(start)
+                
+                self.s3_client.upload_fileobj(
+                    fileobj,
+                    self.bucket_name,
+                    s3_key,
+                    ExtraArgs=extra_args,
+                    Config=_get_transfer_config()
+                )
+            self._forget_heads([s3_key])
             
             logger.info(f"Uploaded file to S3: {s3_key}")
             
@@ -55,7 +123,7 @@ class S3Service:
                 "success": True,
                 "s3_key": s3_key,
                 "bucket": self.bucket_name,
-                "size": len(file_content),
+                "size": size,
                 "upload_time": datetime.now().isoformat()
             }
             
@@ -95,6 +163,7 @@ class S3Service:
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
+            self._forget_heads([s3_key])
             
             logger.info(f"Deleted file from S3: {s3_key}")
             return True
@@ -110,16 +179,21 @@ class S3Service:
             if not s3_keys:
                 return {"deleted": 0, "errors": []}
             
-            # Prepare objects for deletion
-            objects = [{'Key': key} for key in s3_keys]
-            
-            response = self.s3_client.delete_objects(
-                Bucket=self.bucket_name,
-                Delete={'Objects': objects}
-            )
+            # Delete in request-sized batches, collecting results across them
+            deleted = []
+            errors = []
+            for start in range(0, len(s3_keys), DELETE_BATCH_SIZE):
+                objects = [{'Key': key} for key in s3_keys[start:start + DELETE_BATCH_SIZE]]
+                
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': objects}
+                )
+                
+                deleted.extend(response.get('Deleted', []))
+                errors.extend(response.get('Errors', []))
             
-            deleted = response.get('Deleted', [])
-            errors = response.get('Errors', [])
+            self._forget_heads(s3_keys)
             
             logger.info(f"Deleted {len(deleted)} files from S3")
             
@@ -139,16 +213,17 @@ class S3Service:
         """List files in S3 with given prefix"""
         
         try:
-            response = self.s3_client.list_objects_v2(
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            pages = paginator.paginate(
                 Bucket=self.bucket_name,
                 Prefix=prefix,
-                MaxKeys=max_keys
+                PaginationConfig={'MaxItems': max_keys, 'PageSize': min(max_keys, 1000)}
             )
             
             files = []
             
-            if 'Contents' in response:
-                for obj in response['Contents']:
+            for page in pages:
+                for obj in page.get('Contents', []):
                     # Skip directory-like objects
                     if obj['Key'].endswith('/'):
                         continue
@@ -169,34 +244,33 @@ class S3Service:
             logger.error(f"Failed to list files from S3: {e}")
             raise
     
-    def file_exists(self, s3_key: str) -> bool:
+    def file_exists(self, s3_key: str, force_refresh: bool = False) -> bool:
         """Check if file exists in S3"""
         
         try:
-            self.s3_client.head_object(
+            if not force_refresh:
+                with _head_cache_lock:
+                    if (self.bucket_name, s3_key) in _head_cache:
+                        return True
+            
+            # A listing answers 200 whether or not the key exists, so misses cost no error
+            # response; the key itself sorts first among keys sharing it as a prefix
+            response = self.s3_client.list_objects_v2(
                 Bucket=self.bucket_name,
-                Key=s3_key
+                Prefix=s3_key,
+                MaxKeys=1
             )
-            return True
+            return any(obj['Key'] == s3_key for obj in response.get('Contents', []))
             
-        except ClientError as e:
-            if e.response['Error']['Code'] == '404':
-                return False
-            else:
-                logger.error(f"Error checking file existence: {e}")
-                raise
         except Exception as e:
             logger.error(f"Error checking file existence: {e}")
             raise
     
-    def get_file_metadata(self, s3_key: str) -> Dict[str, Any]:
+    def get_file_metadata(self, s3_key: str, force_refresh: bool = False) -> Dict[str, Any]:
         """Get file metadata from S3"""
         
         try:
-            response = self.s3_client.head_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
+            response = self._head_object(s3_key, force_refresh=force_refresh)
             
             return {
                 'key': s3_key,
@@ -218,6 +292,32 @@ class S3Service:
             logger.error(f"Failed to get file metadata: {e}")
             raise
     
+    def _head_object(self, s3_key: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """HEAD an object, reusing a recent response for the same key"""
+        
+        cache_key = (self.bucket_name, s3_key)
+        if not force_refresh:
+            with _head_cache_lock:
+                cached = _head_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        response = self.s3_client.head_object(
+            Bucket=self.bucket_name,
+            Key=s3_key
+        )
+        
+        with _head_cache_lock:
+            _head_cache[cache_key] = response
+        return response
+    
+    def _forget_heads(self, s3_keys: List[str]) -> None:
+        """Drop cached HEAD responses for keys that were written or deleted"""
+        
+        with _head_cache_lock:
+            for s3_key in s3_keys:
+                _head_cache.pop((self.bucket_name, s3_key), None)
+    
     def generate_presigned_url(self, 
                               s3_key: str, 
                               expiration: int = 3600,
@@ -252,6 +352,7 @@ class S3Service:
                 Bucket=self.bucket_name,
                 Key=destination_key
             )
+            self._forget_heads([destination_key])
             
             logger.info(f"Copied file in S3: {source_key} -> {destination_key}")
             
@@ -272,7 +373,7 @@ class S3Service:
                    metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Upload JSON data to S3"""
         
-        json_content = json.dumps(data, indent=2, default=str).encode('utf-8')
+        json_content = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
         
         return self.upload_file(
             file_content=json_content,
@@ -285,10 +386,11 @@ class S3Service:
         """Download and parse JSON from S3"""
         
         try:
+            # orjson parses the body bytes directly, without an intermediate str
             content = self.download_file(s3_key)
-            return json.loads(content.decode('utf-8'))
+            return orjson.loads(content)
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from S3: {e}")
             raise ValueError(f"Invalid JSON content in file: {s3_key}")
         except Exception as e:
@@ -304,62 +406,57 @@ class S3Service:
         if not os.path.exists(local_path):
             raise ValueError(f"Local path does not exist: {local_path}")
         
-        uploaded_files = []
-        total_size = 0
-        
         try:
-            # Walk through local directory
+            # Every file in one backup shares the same backup timestamp
+            backup_timestamp = datetime.now().isoformat()
+            
+            base_prefix = s3_prefix.rstrip('/')
+            
+            # One listing of the destination lets unchanged files be skipped by ETag
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            existing_objects = {
+                obj['Key']: obj
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{base_prefix}/")
+                for obj in page.get('Contents', [])
+            }
+            
+            # Collect the file list first so uploads can run concurrently
+            pending = []
             for root, dirs, files in os.walk(local_path):
                 for file in files:
                     local_file_path = os.path.join(root, file)
                     relative_path = os.path.relpath(local_file_path, local_path)
-                    s3_key = f"{s3_prefix.rstrip('/')}/{relative_path}".replace('\\', '/')
-                    
-                    # Read and upload file
-                    with open(local_file_path, 'rb') as f:
-                        file_content = f.read()
-                    
-                    file_metadata = None
-                    if include_metadata:
-                        stat = os.stat(local_file_path)
-                        file_metadata = {
-                            'original_path': local_file_path,
-                            'backup_timestamp': datetime.now().isoformat(),
-                            'file_size': str(len(file_content)),
-                            'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-                        }
-                    
-                    result = self.upload_file(
-                        file_content=file_content,
-                        s3_key=s3_key,
-                        metadata=file_metadata
-                    )
-                    
-                    uploaded_files.append({
-                        'local_path': local_file_path,
-                        'relative_path': relative_path,
-                        's3_key': s3_key,
-                        'size': len(file_content)
-                    })
-                    
-                    total_size += len(file_content)
+                    s3_key = f"{base_prefix}/{relative_path}".replace('\\', '/')
+                    pending.append((local_file_path, relative_path, s3_key, existing_objects.get(s3_key)))
+            
+            results = []
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(pending))) as executor:
+                    results = list(executor.map(
+                        lambda item: self._backup_file(*item, backup_timestamp, include_metadata=include_metadata),
+                        pending
+                    ))
+            
+            uploaded_files = [file_info for file_info, _ in results]
+            unchanged_count = sum(1 for _, uploaded in results if not uploaded)
+            total_size = sum(file_info['size'] for file_info in uploaded_files)
             
             # Create backup metadata
             backup_metadata = {
                 'backup_type': 'directory',
                 'source_path': local_path,
                 's3_prefix': s3_prefix,
-                'backup_timestamp': datetime.now().isoformat(),
+                'backup_timestamp': backup_timestamp,
                 'file_count': len(uploaded_files),
                 'total_size': total_size,
                 'files': uploaded_files
             }
             
             # Upload backup metadata
-            metadata_key = f"{s3_prefix.rstrip('/')}/backup_metadata.json"
+            metadata_key = f"{base_prefix}/backup_metadata.json"
             self.upload_json(backup_metadata, metadata_key)
             
-            logger.info(f"Created backup: {len(uploaded_files)} files, {total_size} bytes")
+            logger.info(f"Created backup: {len(uploaded_files)} files ({unchanged_count} unchanged), {total_size} bytes")
             
             return backup_metadata
             
@@ -367,6 +464,50 @@ class S3Service:
             logger.error(f"Failed to create backup: {e}")
             raise
     
+    def _backup_file(self,
+                     local_file_path: str,
+                     relative_path: str,
+                     s3_key: str,
+                     existing: Optional[Dict[str, Any]],
+                     backup_timestamp: str,
+                     include_metadata: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """Upload one file of a directory backup unless S3 already holds it, returning whether it was uploaded"""
+        
+        stat = os.stat(local_file_path)
+        
+        file_metadata = None
+        if include_metadata:
+            file_metadata = {
+                'original_path': local_file_path,
+                'backup_timestamp': backup_timestamp,
+                'file_size': str(stat.st_size),
+                'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+            }
+        
+        file_info = {
+            'local_path': local_file_path,
+            'relative_path': relative_path,
+            's3_key': s3_key,
+            'size': stat.st_size
+        }
+        
+        with open(local_file_path, 'rb') as f:
+            # Small files go up in one put_object; large ones stream from the open file
+            file_content = f.read() if stat.st_size <= MULTIPART_THRESHOLD else f
+            
+            if existing is not None and existing['Size'] == stat.st_size:
+                if existing['ETag'].strip('"') == _s3_etag(file_content):
+                    return file_info, False
+                f.seek(0)
+            
+            self.upload_file(
+                file_content=file_content,
+                s3_key=s3_key,
+                metadata=file_metadata
+            )
+        
+        return file_info, True
+    
     def restore_backup(self, 
                       s3_prefix: str, 
                       local_path: str,
@@ -381,34 +522,71 @@ class S3Service:
             metadata_key = f"{s3_prefix.rstrip('/')}/backup_metadata.json"
             backup_metadata = self.download_json(metadata_key)
             
-            restored_files = []
+            pending = []
+            
+            # One walk of the destination replaces a stat per manifest entry
+            existing_files = set()
+            if not overwrite:
+                existing_files = {
+                    os.path.normpath(os.path.join(root, file))
+                    for root, dirs, files in os.walk(local_path)
+                    for file in files
+                }
             
             for file_info in backup_metadata.get('files', []):
                 s3_key = file_info['s3_key']
                 relative_path = file_info['relative_path']
                 local_file_path = os.path.join(local_path, relative_path)
                 
-                # Create directory if needed
-                local_dir = os.path.dirname(local_file_path)
-                if local_dir:
-                    os.makedirs(local_dir, exist_ok=True)
-                
                 # Check if file exists and handle overwrite
-                if os.path.exists(local_file_path) and not overwrite:
+                if os.path.normpath(local_file_path) in existing_files:
                     logger.warning(f"Skipping existing file: {local_file_path}")
                     continue
                 
-                # Download and restore file
-                file_content = self.download_file(s3_key)
+                pending.append((s3_key, local_file_path))
+            
+            # Create each destination directory once, before any download starts
+            for local_dir in {os.path.dirname(local_file_path) for _, local_file_path in pending}:
+                if local_dir:
+                    os.makedirs(local_dir, exist_ok=True)
+            
+            def restore_one(s3_key: str, local_file_path: str) -> Dict[str, Any]:
+                # Stream to a sibling temp file and only replace the destination once the
+                # download succeeded, so a failure never truncates an existing file
+                local_dir = os.path.dirname(local_file_path) or '.'
+                with tempfile.NamedTemporaryFile(dir=local_dir, prefix=f".{os.path.basename(local_file_path)}.",
+                                                 suffix='.tmp', delete=False) as f:
+                    temp_path = f.name
+                    try:
+                        self.s3_client.download_fileobj(
+                            self.bucket_name,
+                            s3_key,
+                            f,
+                            Config=_get_transfer_config()
+                        )
+                        size = f.tell()
+                    except BaseException as e:
+                        f.close()
+                        os.unlink(temp_path)
+                        if isinstance(e, ClientError) and e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                            raise FileNotFoundError(f"File not found in S3: {s3_key}")
+                        raise
+                
+                os.replace(temp_path, local_file_path)
                 
-                with open(local_file_path, 'wb') as f:
-                    f.write(file_content)
+                logger.info(f"Downloaded file from S3: {s3_key}")
                 
-                restored_files.append({
+                return {
                     's3_key': s3_key,
                     'local_path': local_file_path,
-                    'size': len(file_content)
-                })
+                    'size': size
+                }
+            
+            # Download and restore files concurrently, keeping the manifest order in the result
+            restored_files = []
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(pending))) as executor:
+                    restored_files = list(executor.map(lambda item: restore_one(*item), pending))
             
             logger.info(f"Restored backup: {len(restored_files)} files")
             